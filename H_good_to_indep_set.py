@@ -1,187 +1,424 @@
-import gurobipy as gp
-from gurobipy import GRB
 import time
-from math import sqrt
 import itertools
+from collections import OrderedDict
+from functools import lru_cache
+import numpy as np
 
-from edge_repr_permutations import edge_to_bit_location, bit_location_to_edge, subgraph_isomorphism
-from bigadjacencymatrix import Big_matrix
+from edge_repr_permutations import (code_from_edges, code_to_str, nodes_from_number_of_edges, number_of_edges,
+                                    canonical_family, contains_h, h_family_embeddings)
+from solvers import GurobiBackend, IndependentSetProblem, SolveResult, get_backend
 
-def IndependentSet(size:int, M:list):
-    """ The ILP to solve the independent set problem, given an adjacency matrix M and number of vertices given by 'size'.
+def IndependentSet(size:int, edges:tuple = None, reduced:bool = False, backend = "gurobi", S = None) -> SolveResult:
+    """ Solves the independent set problem, given the edges of a graph on the graph codes 0, ..., size - 1.
     
     Input
         :int size: number of vertices of the graph
-        :list M: adjacency matrix for the graph
+        :tuple edges: arrays (rows, cols) with the endpoints of all edges (see CayleyEdges and EdgesFromMatrix)
+        :bool reduced: only model the graphs not conflicting with the empty graph and break the S_n symmetry (see SymmetryBreaking)
+        :backend: a backend from solvers.BACKENDS, or its name
+        :np.ndarray S: generating set of the conflict graph Cay({0,1}^m, S); in reduced mode the model is then built from S
+            directly (see ReducedProblem) and edges may be None, otherwise edges defaults to CayleyEdges(n, S)
     
     Output:
-        :list x: optimal solution to the independent set problem, gives 1's where the vertex is in the independent set"""
-    starttime = time.time()
-
-    # Create a new model
-    m1 = gp.Model("newModel")
-    m1.Params.LogToConsole = 0
-
-    # Add variables
-    X = [m1.addVar(vtype=GRB.INTEGER, name="x["+ str(s)+"]") for s in range(size)]
-
-    # Set objective function
-    m1.setObjective(sum(X[i] for i in range(size)), GRB.MAXIMIZE)
-
-    # Add simple constraints
-    for i in range(size):
-        for j in range(i):
-            if M[i][j] == 1:
-                m1.addConstr(X[i] + X[j] <= 1)
-        m1.addConstr(X[i] <= 1)
+        :SolveResult result: size of the maximum independent set, the graph codes in it and the solve time"""
+    if reduced and S is not None:
+        return get_backend(backend).solve(ReducedProblem(nodes_from_number_of_edges(size.bit_length() - 1), S))
+    if edges is None:
+        edges = CayleyEdges(nodes_from_number_of_edges(size.bit_length() - 1), S)
+    rows, cols = (np.asarray(a, dtype=np.int64) for a in edges)
     # We can always assume the empty graph is a part of our solution, 
     # since if it isn't, we take a graph from the solution and apply symmetric difference with this graph to all other graphs in the solution 
-    m1.addConstr(X[0] >= 1)
-
-    # Optimize
-    m1.optimize()
-
-    for v in m1.getVars():
-        if v.x != 0:
-            print(v.varName, v.Xn)
+    # In reduced mode, the graphs conflicting with the empty graph are therefore left out of the model
+    keep = np.ones(size, dtype=bool)
+    if reduced:
+        keep[rows[cols == 0]] = False
+        keep[cols[rows == 0]] = False
+        keep[0] = True
+    return get_backend(backend).solve(BuildProblem(size, rows, cols, keep, reduced))
 
+def MaxClique(size:int, edges:tuple = None, reduced:bool = False, backend = "gurobi", S = None) -> SolveResult:
+    """ Solves the maximum clique problem, given the edges of a graph on the graph codes 0, ..., size - 1,
+    as the independent set problem on the complement. The complement is built in blocks of vertex pairs (see PairEdges),
+    so no dense size x size matrix is needed, but it has up to size**2 / 2 edges.
+    In reduced mode the graph must be a Cayley graph Cay({0,1}^m, S), and the model is built from S (see ReducedProblem);
+    if S is not given, it is read off as the neighbours of the empty graph.
+    With the Gurobi backend given by name, up to 10 optimal solutions are collected in the solution pool (result.pool).
     
-    endtime = time.time()
-    return m1.ObjVal, endtime - starttime 
+    Input and output as for IndependentSet."""
+    if backend == GurobiBackend.name:
+        backend = GurobiBackend(pool_solutions=10)
+    n = nodes_from_number_of_edges(size.bit_length() - 1)
+    if edges is None and (S is None or not reduced):
+        edges = CayleyEdges(n, S)
+    if edges is not None:
+        rows, cols = (np.asarray(a, dtype=np.int64) for a in edges)
+    if reduced:
+        if S is None:
+            S = np.union1d(rows[cols == 0], cols[rows == 0])
+        return get_backend(backend).solve(ReducedProblem(n, S, clique=True))
+    # Encode every edge as one integer, so the edges of a block of pairs can be looked up in the sorted codes
+    encoded = np.sort(np.concatenate((rows * size + cols, cols * size + rows)))
+    def complement(i, j):
+        pairs = i * size + j
+        found = np.minimum(np.searchsorted(encoded, pairs), max(len(encoded) - 1, 0))
+        return encoded[found] != pairs if len(encoded) else np.ones(pairs.shape, dtype=bool)
+    compl_rows, compl_cols = PairEdges(size, complement)
+    return get_backend(backend).solve(IndependentSetProblem(np.arange(size), compl_rows, compl_cols))
 
-def MaxClique(size:int, M:list):
-    starttime = time.time()
-
-    # Create a new model
-    m2 = gp.Model("newModel")
-    m2.Params.LogToConsole = 0
-
-    # Add variables
-    X = [m2.addVar(vtype=GRB.INTEGER, name="x["+ str(s)+"]") for s in range(size)]
-
-    # Set objective function
-    m2.setObjective(sum(X[i] for i in range(size)), GRB.MAXIMIZE)
-
-    # Add simple constraints
-    for i in range(size):
-        for j in range(i):
-            if M[i][j] == 0:
-                m2.addConstr(X[i] + X[j] <= 1)
-        m2.addConstr(X[i] <= 1)
-    # We can always assume the empty graph is a part of our solution, 
-    # since if it isn't, we take a graph from the solution and apply symmetric difference with this graph to all other graphs in the solution 
-    m2.addConstr(X[0] >= 1)
+def BuildProblem(size:int, rows:np.ndarray, cols:np.ndarray, keep:np.ndarray, reduced:bool) -> IndependentSetProblem:
+    """Restricts the independent set problem with the given conflict edges to the graph codes with keep[g] True,
+    adding the symmetry breaking levels in reduced mode."""
+    vertices = np.flatnonzero(keep)
+    position = np.full(size, -1, dtype=np.int64)
+    position[vertices] = np.arange(len(vertices))
+    inside = keep[rows] & keep[cols]
+    levels = dict()
+    if reduced:
+        n = nodes_from_number_of_edges(size.bit_length() - 1)
+        levels = {k: position[representatives].tolist() for k, representatives in SymmetryBreaking(n, vertices[1:]).items()}
+    return IndependentSetProblem(vertices, position[rows[inside]], position[cols[inside]], levels)
 
+def ReducedProblem(n:int, S, clique:bool = False) -> IndependentSetProblem:
+    """Builds the reduced independent set problem (see IndependentSet) of the conflict graph Cay({0,1}^m, S) directly
+    from S, without the 2**m * |S| / 2 edges of the whole graph (over 4 * 10**8 at n = 6).
+    For the independent set the vertices are the empty graph and the graphs outside S, joined when their xor is in S.
+    For the clique (clique=True) they are the empty graph and the graphs in S, joined when their xor is not in S,
+    which is the complement in which the maximum clique is a maximum independent set.
+    
+    Input:
+        :int n: number of vertices
+        :np.ndarray S: generating set (see GeneratingSet and bitmap_to_set)
+        :bool clique: build the model of MaxClique instead of IndependentSet
+    
+    Output:
+        :IndependentSetProblem problem: with the symmetry breaking levels of SymmetryBreaking"""
+    in_S = np.zeros(2**number_of_edges(n), dtype=bool)
+    in_S[np.asarray(S, dtype=np.int64)] = True
+    # The empty graph contains no H, so it is never in S
+    vertices = np.concatenate(([0], np.flatnonzero(in_S if clique else ~in_S)[int(not clique):]))
+    rows, cols = PairEdges(len(vertices), lambda i, j: in_S[vertices[i] ^ vertices[j]] != clique)
+    levels = {k: np.searchsorted(vertices, representatives).tolist()
+              for k, representatives in SymmetryBreaking(n, vertices[1:]).items()}
+    return IndependentSetProblem(vertices, rows, cols, levels)
 
-    # Configure solution pool settings
-    m2.setParam(GRB.Param.PoolSearchMode, 2)
-    m2.setParam(GRB.Param.PoolSolutions, 10)
+def PairEdges(size:int, adjacent, block_size:int = 2**22) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the edges (i, j) with i > j among the vertices 0, ..., size - 1, testing blocks of about block_size
+    pairs at a time with adjacent(i, j), which takes broadcastable integer arrays and returns a boolean array."""
+    rows, cols = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+    step = max(1, block_size // max(size, 1))
+    for start in range(1, size, step):
+        i = np.arange(start, min(start + step, size), dtype=np.int64)[:, None]
+        j = np.arange(i[-1, 0], dtype=np.int64)[None, :]
+        block_rows, block_cols = np.nonzero((j < i) & adjacent(i, j))
+        rows.append(i[block_rows, 0])
+        cols.append(block_cols.astype(np.int64))
+    return np.concatenate(rows), np.concatenate(cols)
 
-    # Optimize
-    m2.optimize()
+@lru_cache(maxsize=1)
+def CanonicalForms(n:int) -> np.ndarray:
+    """Computes the canonical form (see edge_repr_permutations.canonical_form) of all graphs on n vertices at once.
+    Relabelling by S_n is generated by the transpositions (v, v+1), so the smallest code in every orbit is found by repeatedly
+    taking the minimum label over the images under these transpositions, with pointer jumping to speed up convergence.
     
-    # Retrieve solutions from the solution pool
-    num_solutions = m2.SolCount  # Number of solutions found
-    print(f"Number of solutions found: {num_solutions}")
+    Output:
+        :np.ndarray canon: canon[g] is the smallest code isomorphic to g; the orbit representatives are the g with canon[g] == g
+            (read-only, since the result is cached for the most recent n)"""
+    size = 2**number_of_edges(n)
+    codes = np.arange(size, dtype=np.int64)
+    generators = list()
+    for v in range(1, n):
+        permutation = list(range(1, n + 1))
+        permutation[v - 1], permutation[v] = v + 1, v
+        image = np.zeros(size, dtype=np.int64)
+        for node1, node2 in itertools.combinations(range(1, n + 1), 2):
+            bit = np.int64(code_from_edges(n, [(node1, node2)]))
+            target = np.int64(code_from_edges(n, [(permutation[node1 - 1], permutation[node2 - 1])]))
+            image |= np.where(codes & bit, target, 0)
+        generators.append(image)
 
-    for i in range(min(num_solutions, 10)):  # Retrieve at most 10 solutions
-        m2.setParam(GRB.Param.SolutionNumber, i)
-        print(f"\nSolution {i + 1}:")
-        for v in m2.getVars():
-            if v.Xn > 1e-7:
-                print(v.varName, v.Xn)
-        print()
+    canon = codes.copy()
+    while True:
+        previous = canon.copy()
+        for image in generators:
+            np.minimum(canon, canon[image], out=canon)
+        canon = canon[canon]
+        if np.array_equal(canon, previous):
+            canon.flags.writeable = False
+            return canon
 
+def SymmetryBreaking(n:int, compatible) -> dict[int, list[int]]:
+    """Groups the orbit representatives among the graphs compatible with the empty graph by their number of edges.
+    This generalises fixing the empty graph in the solution, using that relabelling the vertices and xor translation are
+    automorphisms of the conflict graph (and of its complement).
+    Take the pair a, b in an optimal solution whose symmetric difference d has the fewest edges, translate the solution by a
+    and relabel so that d becomes its orbit representative r. The new solution contains 0 and r, and all its other
+    graphs have at least as many edges as r. So a solver may fix one representative r next to the empty graph and drop
+    all graphs with fewer edges than r, as long as it tries every level.
+    
+    Input:
+        :int n: number of vertices
+        :list compatible: nonzero codes that may be in a solution together with the empty graph
     
-    endtime = time.time()  
-    return m2.ObjVal, endtime - starttime 
+    Output:
+        :dict levels: levels[k] is the sorted list of representatives with k edges that are compatible"""
+    canon = CanonicalForms(n)
+    compatible = np.asarray(compatible, dtype=np.int64)
+    levels = dict()
+    for g in compatible[canon[compatible] == compatible].tolist():
+        levels.setdefault(g.bit_count(), list()).append(g)
+    return levels
 
-def BuildAdjancencyMatrix(graphs:list[str], H: list[str]) -> tuple[int,list]:
+def BuildAdjancencyMatrix(graphs, H: list[int], number_of_nodes: int) -> tuple[int,list]:
     """Builds the adjacency matrix of the following graph: 
     Vertices are the graphs in the list 'graphs', edges are between two graphs whose symmetric difference is in H
     
     Input
-    :list[nx.Graph] graphs: list of graphs to be studied
-    :list[nx.Graph] H: family of graphs not to be seen in symmetric difference"""
+    :np.ndarray graphs: integer codes of the graphs to be studied (e.g. as returned by BuildGraphs, or any subset)
+    :list[int] H: integer codes of the family of graphs not to be seen in symmetric difference
+    :int number_of_nodes: number of vertices of the graphs"""
     size = len(graphs)
+    graphs = [int(g) for g in graphs]
     M = [[0 for _ in range(i)] for i in range(size)]
 
     for i in range(size):
         for j in range(i):
-            if symmetric_diff_contains_an_h(graphs[i], graphs[j], H):
+            if symmetric_diff_contains_an_h(graphs[i], graphs[j], H, number_of_nodes):
                 M[i][j] = 1
     return size, M
 
-def symmetric_difference(g1:str, g2:str) -> str:
-    """Returns the symmetric difference of two binary edge representations, functions the same as bitwise xor
+def symmetric_difference(g1, g2):
+    """Returns the symmetric difference of two graphs in integer representation, which is their bitwise xor.
+    Works elementwise if g1 and/or g2 are NumPy arrays of graph codes.
     
     Input:
-        :str g1,g2: binary edge-representations of the two graphs being analysed
+        :int g1,g2: integer edge-representations of the two graphs being analysed
         
     Output:
-        :str x: symmetric difference of the two graphs"""
-    x = str()
-    for i, g1i in enumerate(g1):
-        if g1i != g2[i]:
-            x += '1'
+        :int x: symmetric difference of the two graphs"""
+    return g1 ^ g2
+
+class ContainmentCache:
+    """Bounded cache of H-containment results, keyed by the graph and the canonical id of the family H.
+    For n <= CANONICAL_TABLE_MAX_N the graph is keyed by its canonical form, looked up in canonical_form_table, so
+    isomorphic graphs share one entry. For larger n that table would need O(2**m) time and memory (gigabytes at n = 8),
+    and canonical labelling a single graph costs more than testing it, so the graph is keyed by its own code instead.
+    The least recently used entry is evicted when maxsize entries are stored, which bounds the memory for every n.
+    
+    :int maxsize: maximum number of entries (None for no limit)"""
+
+    def __init__(self, maxsize:int = 2**16):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, g:int, H:list, number_of_nodes:int) -> tuple:
+        if number_of_nodes <= CANONICAL_TABLE_MAX_N:
+            g = canonical_form_table(number_of_nodes)[g]
+        return int(g), family_id(tuple(H), number_of_nodes)
+
+    def get(self, key:tuple):
+        """Returns the cached result for key, or None on a miss."""
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
         else:
-            x += '0'
-    return x
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key:tuple, value:bool) -> None:
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if self.maxsize is not None and len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
 
-memo = dict()
-def symmetric_diff_contains_an_h(g1:str, g2:str, H:list) -> bool:
+# Largest n for which ContainmentCache keys graphs by their canonical form (2**15 graphs, the table takes about 10 ms)
+CANONICAL_TABLE_MAX_N = 6
+
+@lru_cache(maxsize=1)
+def canonical_form_table(n:int) -> list[int]:
+    """CanonicalForms(n) as a list, for fast lookups of single graphs. Only the table of the most recent n is kept."""
+    if n > CANONICAL_TABLE_MAX_N:
+        raise ValueError(f"the canonical form table is only built up to n = {CANONICAL_TABLE_MAX_N}, not for n = {n}")
+    return CanonicalForms(n).tolist()
+
+@lru_cache(maxsize=128)
+def family_id(H:tuple, number_of_nodes:int) -> tuple:
+    """Cached canonical id of the family H (see edge_repr_permutations.canonical_family)."""
+    return canonical_family(H, number_of_nodes)
+
+memo = ContainmentCache()
+def symmetric_diff_contains_an_h(g1:int, g2:int, H:list, number_of_nodes:int) -> bool:
     """Computes whether the symmetric difference of the input graphs has a subgraph which is isomorphic to a graph in the list H. 
     This function is currently unneccesary.
     
     Input: 
-        :str g1, g2: binary input graphs to be analysed
-        :list H: family of graphs
+        :int g1, g2: integer codes of the input graphs to be analysed
+        :list H: family of graphs, as integer codes on number_of_nodes vertices
+        :int number_of_nodes: number of vertices of the graphs
         
     Output:
         :bool 1/0: 1 if True, 0 if not"""
 
+    return contains_an_h(symmetric_difference(g1, g2), H, number_of_nodes)
 
-    symm_diff = symmetric_difference(g1, g2)
-    for H_graph in H:
-        if (symm_diff,H_graph) in memo:
-            x = memo[(symm_diff,H_graph)]
-        else:
-            x = subgraph_isomorphism(step = 0, g = symm_diff,  number_of_nodes = int((1 + sqrt(1 + 8 * len(g1)))//2),
-                                h_graph = H_graph, h_graph_number_nodes = 3, map_dict = dict(), has_been_mapped = list())
-            memo[(symm_diff,H_graph)] = x
-        if x:
-            return 1
-    return 0
+def contains_an_h(g:int, H:list, number_of_nodes:int) -> bool:
+    """Computes whether the graph g has a subgraph which is isomorphic to a graph in the list H.
+    
+    Input: 
+        :int g: integer code of the graph to be analysed
+        :list H: family of graphs, as integer codes on number_of_nodes vertices
+        :int number_of_nodes: number of vertices of the graphs
+        
+    Output:
+        :bool 1/0: 1 if True, 0 if not"""
+    key = memo.key(g, H, number_of_nodes)
+    x = memo.get(key)
+    if x is None:
+        x = any(contains_h(g, number_of_nodes, H_graph) for H_graph in H)
+        memo.put(key, x)
+    return 1 if x else 0
 
-def BuildGraphs(n: int) -> list[str]:
-    """Generates all graphs on n vertices and returns their binary string representations."""
-    graphs = list()
-    num_edges = n * (n - 1) // 2  # Number of edges in the complete graph (excluding loops)
+def GeneratingSet(n:int, H:list, memoize:bool = True) -> np.ndarray:
+    """Computes the generating set S of the conflict graph, i.e. all graphs on n vertices containing a graph from H.
+    Two graphs g1, g2 conflict iff g1 xor g2 is in S, so the conflict graph is the Cayley graph Cay({0,1}^m, S).
     
-    # Iterate over all possible edge combinations
-    for edges in itertools.product("01", repeat=num_edges):
-        binary_string = "".join(edges)  # Convert tuple to string
-        graphs.append(binary_string)
+    Input:
+        :int n: number of vertices
+        :list H: family of graphs, as integer codes on n vertices
+        :bool memoize: look the graphs up in memo (see contains_an_h), otherwise test every graph with contains_h
+    
+    Output:
+        :np.ndarray S: sorted integer codes of the graphs in S"""
+    H = [int(h_graph) for h_graph in H]
+    if memoize:
+        return np.array([g for g in range(2**number_of_edges(n)) if contains_an_h(g, H, n)], dtype=np.uint64)
+    return np.array([g for g in range(2**number_of_edges(n)) if any(contains_h(g, n, h_graph) for h_graph in H)],
+                    dtype=np.uint64)
+
+def GeneratingBitmap(n:int, H:list, block_size:int = 2**20, verbose:bool = False) -> tuple[np.ndarray, float]:
+    """Computes the generating set S for all 2**m graphs at once with NumPy, as a packed bitmap.
+    All copies of the graphs in H are enumerated as edge masks, and (G & mask) == mask is evaluated on blocks of
+    block_size consecutive graph codes, so memory stays bounded by the block size (plus the bitmap of 2**m / 8 bytes).
+    
+    Input:
+        :int n: number of vertices
+        :list H: family of graphs, as integer codes on n vertices
+        :int block_size: number of graphs per block (rounded up to a multiple of 8)
+        :bool verbose: print the throughput of every block
+    
+    Output:
+        :np.ndarray bitmap: packed bitmap (bitorder 'little'), bit g is set iff graph g is in S
+        :float throughput: graphs per second over the whole universe"""
+    starttime = time.time()
+    size = 2**number_of_edges(n)
+    block_size = -(-block_size // 8) * 8
+    masks = [np.uint64(mask) for mask in h_family_embeddings(n, H)]
+    bitmap = np.zeros(-(-size // 8), dtype=np.uint8)
+    hit = np.empty(min(block_size, size), dtype=bool)
+    scratch = np.empty(min(block_size, size), dtype=np.uint64)
+
+    for start in range(0, size, block_size):
+        blocktime = time.time()
+        stop = min(start + block_size, size)
+        bitmap[start // 8: -(-stop // 8)] = PackedBlock(start, stop, masks, hit, scratch)
+        if verbose:
+            print(f"graphs {start}-{stop}: {(stop - start) / max(time.time() - blocktime, 1e-9):.0f} graphs/s")
+
+    throughput = size / max(time.time() - starttime, 1e-9)
+    if verbose:
+        print(f"{size} graphs, {len(masks)} masks, {throughput:.0f} graphs/s")
+    return bitmap, throughput
+
+def PackedBlock(start:int, stop:int, masks:list, hit:np.ndarray = None, scratch:np.ndarray = None) -> np.ndarray:
+    """Evaluates which of the graph codes start, ..., stop - 1 contain one of the edge masks, packed as in GeneratingBitmap.
+    start should be a multiple of 8; hit and scratch are optional work arrays of at least stop - start elements."""
+    codes = np.arange(start, stop, dtype=np.uint64)
+    block_hit = np.empty(stop - start, dtype=bool) if hit is None else hit[:stop - start]
+    block_scratch = np.empty(stop - start, dtype=np.uint64) if scratch is None else scratch[:stop - start]
+    block_hit[:] = False
+    for mask in masks:
+        np.bitwise_and(codes, mask, out=block_scratch)
+        block_hit |= block_scratch == mask
+    return np.packbits(block_hit, bitorder="little")
+
+def bitmap_to_set(bitmap:np.ndarray, n:int) -> np.ndarray:
+    """Converts a packed bitmap of S (see GeneratingBitmap) to the sorted integer codes of S."""
+    size = 2**number_of_edges(n)
+    return np.flatnonzero(np.unpackbits(bitmap, count=size, bitorder="little")).astype(np.uint64)
+
+def cayley_neighbours(i:int, S):
+    """Generates the neighbours of vertex i in the Cayley graph Cay({0,1}^m, S), without storing the graph."""
+    for s in S:
+        yield i ^ int(s)
+
+def BuildCayleyGraph(n:int, H:list, S = None) -> tuple[int, np.ndarray, np.ndarray]:
+    """Builds the conflict graph on all graphs on n vertices as a sparse (CSR) neighbour structure.
+    Since adjacency only depends on g_i xor g_j, S is computed once and the neighbours of i are i xor s for s in S,
+    which replaces the O(N^2) pairwise tests of BuildAdjancencyMatrix by O(N * |S|) work.
+    
+    Input:
+        :int n: number of vertices
+        :list H: family of graphs, as integer codes on n vertices
+        :np.ndarray S: optional precomputed generating set (see GeneratingSet)
+    
+    Output:
+        :int size: number of vertices of the conflict graph
+        :np.ndarray indptr, indices: the neighbours of vertex i are indices[indptr[i]:indptr[i+1]] (sorted)"""
+    if S is None:
+        S = GeneratingSet(n, H)
+    S = np.asarray(S, dtype=np.uint64)
+    size = 2**number_of_edges(n)
+    indptr = np.arange(size + 1, dtype=np.int64) * len(S)
+    indices = np.sort(np.arange(size, dtype=np.uint64)[:, None] ^ S[None, :], axis=1).reshape(-1)
+    return size, indptr, indices
+
+def BuildGraphs(n: int) -> np.ndarray:
+    """Generates all graphs on n vertices and returns their integer codes.
+    Graph i has the edge at bit location k iff bit k - 1 of i is set, so the codes are simply 0, 1, ..., 2**(n(n-1)/2) - 1."""
+    num_edges = number_of_edges(n)  # Number of edges in the complete graph (excluding loops)
+    return np.arange(2**num_edges, dtype=np.uint64)
+
+def BuildGraphStrings(n: int) -> list[str]:
+    """Generates all graphs on n vertices and returns their binary string representations, in the order of BuildGraphs."""
+    return [code_to_str(g, n) for g in range(2**number_of_edges(n))]
+
+def CayleyEdges(n:int, S) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the edges (i, j) with i > j of the conflict graph on all graphs on n vertices, given its generating set S.
+    
+    Output:
+        :np.ndarray rows, cols: the endpoints of the edges, rows[e] = cols[e] xor s for some s in S"""
+    S = np.asarray(S, dtype=np.int64)
+    codes = np.arange(2**number_of_edges(n), dtype=np.int64)
+    rows, cols = list(), list()
+    for s in S:
+        neighbours = codes ^ s
+        larger = codes > neighbours
+        rows.append(codes[larger])
+        cols.append(neighbours[larger])
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(rows), np.concatenate(cols)
 
-    return graphs
+def EdgesFromMatrix(M:list) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the edges (i, j) with i > j of a lower-triangular adjacency matrix, as built by BuildAdjancencyMatrix."""
+    rows = [i for i in range(len(M)) for j in range(i) if M[i][j] == 1]
+    cols = [j for i in range(len(M)) for j in range(i) if M[i][j] == 1]
+    return np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)
 
 def main():
-    n = 5
-    graphs_n = BuildGraphs(n)
-
-    k3 = '0' * (n * (n - 1) // 2)
-    for j in range(3):
-        for i in range(j):
-            index = edge_to_bit_location(n,i+1,j+1)
-            k3 = k3[:index - 1] + '1' + k3[index:]
-
-    # size, M = BuildAdjancencyMatrix(graphs_n, [k3])
-    size = 2**((n - 1) * n // 2)
-    M = Big_matrix()
-    optimalInd, timing1 = IndependentSet(size,M)
-    # optimalCliq, timing2 = MaxClique(size, M)
-    print(optimalInd)
-    # print(optimalCliq)
+    from sweep import run_case
+    record = run_case(5, "K3", backend="gurobi")
+    print(record["counters"]["objective"], record["stages"]["solve"]["time"])
     return
 
 if __name__ == "__main__":
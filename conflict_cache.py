@@ -0,0 +1,60 @@
+""" This file stores the generating set S of the conflict graph on disk, so that expensive builds can be reused.
+The conflict graph on all graphs on n vertices is the Cayley graph with generating set S (see H_good_to_indep_set),
+so S as a packed bitmap (bit g is set iff graph g is in S, bitorder 'little') is all that needs to be stored.
+Files are keyed by n and the canonical id of the family H, and are loaded with a memory map."""
+
+import os
+import numpy as np
+
+from edge_repr_permutations import canonical_family, number_of_edges
+
+CACHE_DIR = "conflict_cache"
+
+def cache_path(n:int, H:list, cache_dir:str = CACHE_DIR) -> str:
+    """Returns the file storing S for the graphs on n vertices and the family H.
+    Isomorphic members of H (and their order) do not change the path."""
+    family = "-".join(format(h_graph, "x") for h_graph in canonical_family(H, n))
+    return os.path.join(cache_dir, f"S_n{n}_H{family}.bin")
+
+def bitmap_size(n:int) -> int:
+    """Number of bytes of the packed bitmap of S for graphs on n vertices."""
+    return -(-2**number_of_edges(n) // 8)
+
+def load_generating_bitmap(n:int, H:list, cache_dir:str = CACHE_DIR):
+    """Loads the packed bitmap of S from the cache as a read-only memory map.
+    
+    Output:
+        :np.memmap bitmap: the bitmap, or None if it is not in the cache (or the file has the wrong size)"""
+    path = cache_path(n, H, cache_dir)
+    if not os.path.exists(path) or os.path.getsize(path) != bitmap_size(n):
+        return None
+    return np.memmap(path, dtype=np.uint8, mode="r")
+
+def save_generating_bitmap(n:int, H:list, bitmap:np.ndarray, cache_dir:str = CACHE_DIR) -> str:
+    """Writes the packed bitmap of S to the cache and returns its path.
+    The file is written under a temporary name first, so an interrupted run never leaves a truncated cache entry."""
+    bitmap = np.asarray(bitmap, dtype=np.uint8)
+    if bitmap.size != bitmap_size(n):
+        raise ValueError(f"bitmap has {bitmap.size} bytes, expected {bitmap_size(n)} for n = {n}")
+    path = cache_path(n, H, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    bitmap.tofile(path + ".tmp")
+    os.replace(path + ".tmp", path)
+    return path
+
+def cached_generating_bitmap(n:int, H:list, build, cache_dir:str = CACHE_DIR):
+    """Returns the packed bitmap of S, loading it from the cache or building and persisting it on a miss.
+    
+    Input:
+        :int n: number of vertices
+        :list H: family of graphs, as integer codes on n vertices
+        :callable build: build(n, H) returns the packed bitmap, used on a cache miss
+        :str cache_dir: directory of the cache
+    
+    Output:
+        :np.ndarray bitmap: the packed bitmap (a memory map when it was loaded from the cache)"""
+    bitmap = load_generating_bitmap(n, H, cache_dir)
+    if bitmap is None:
+        save_generating_bitmap(n, H, build(n, H), cache_dir)
+        bitmap = load_generating_bitmap(n, H, cache_dir)
+    return bitmap
@@ -1,7 +1,12 @@
-""" This file is meant to store the functions meant for finding a subgraph in a graph. Two are given"""
+""" This file is meant to store the functions meant for finding a subgraph in a graph. Two are given, plus a faster test based on precomputed embeddings."""
 
-from math import sqrt
-from copy import deepcopy
+from math import isqrt
+from functools import lru_cache
+from itertools import permutations
+
+# Graphs on n labelled vertices are stored as integers: the edge at bit location k (see edge_to_bit_location)
+# is bit k - 1 of the integer. This is the same ordering as the Sage notebook, where graph i has edge j iff i & (1 << j).
+# Binary strings (character k - 1 is the edge at bit location k) are only used at the boundaries.
 
 def edge_to_bit_location(number_of_nodes:int, node1:int, node2:int) -> int:
     """In binary edge representation, returns the bit belonging to the edge (node1,node2), based on the number of nodes.
@@ -22,89 +27,252 @@ def bit_location_to_edge(number_of_nodes:int, bit_location:int) -> tuple[int,int
         \n(x - 1) * number_of_nodes - x * (x-1) / 2 = bit_location\n
     and rounding down to get the value for node 1. Then the value for node 2 is found by solving
         \n(node1 - 1) * number_of_nodes - node1 * (node1 - 1) / 2 + y - node1 = bit_location\n
-    for y.
+    for y. The square root is taken in integer arithmetic and node 1 is corrected afterwards, so the result is exact.
     
     Input:
         :int number_of_nodes: the number of nodes of the graph.
-        :int bit_location: location of the bit (from the left of the binary string)"""
-    num = (1+2*number_of_nodes) - sqrt((1+2*number_of_nodes)**2 - 4*2*(number_of_nodes - 1 + bit_location))
-    node1 = num // 2
+        :int bit_location: location of the bit (from the left of the binary string)
+    
+    Output:
+        :tuple[int,int]: the edge (node1,node2) with node1 < node2"""
+    node1 = ((1 + 2 * number_of_nodes) - isqrt((1 + 2 * number_of_nodes)**2 - 8 * (number_of_nodes - 1 + bit_location))) // 2
+    # The first bit location of the edges (node1, .) is edge_to_bit_location(number_of_nodes, node1, node1 + 1)
+    while node1 > 1 and edge_to_bit_location(number_of_nodes, node1, node1 + 1) > bit_location:
+        node1 -= 1
+    while node1 + 1 < number_of_nodes and edge_to_bit_location(number_of_nodes, node1 + 1, node1 + 2) <= bit_location:
+        node1 += 1
     node2 = bit_location - (node1 - 1) * number_of_nodes + node1 * (node1 - 1) // 2 + node1
     return (node1, node2)
 
+def number_of_edges(number_of_nodes:int) -> int:
+    """Returns the number of edges of the complete graph on number_of_nodes vertices, i.e. the length of the edge representation."""
+    return number_of_nodes * (number_of_nodes - 1) // 2
 
-def find_clique(edge_repr: str, size_clique) -> bool:    
-    """This function computes whether there exists a clique of the input size in the graph, given by its binary representation."""
-
-    #   def Bron_Kerbosch1(R:list,P:list,X:list) -> None:
-    #     global largest_clique
-    #     if len(P) == 0 and len(X) == 0:
-    #         if len(R) > len(largest_clique):
-    #             largest_clique = R
-    #         return
-    #     u = (P+X).pop()
-    #     pivot_list = [p for p in P if p not in local_network.neighbors(u)]
-    #     for v in pivot_list:
-    #         Bron_Kerbosch1(R + [v],
-    #                        [p for p in P if p in local_network.neighbors(v)],
-    #                        [x for x in X if x in local_network.neighbors(v)])
-    #         P.remove(v)
-    #         X += [v]  
-
-    # def Bron_Kerbosch2(G:nx.Graph) -> None:
-    #     def degen_ordering(G: nx.Graph):
-    #         if len(G.nodes) == 0:
-    #             return []
-    #         min_degree_node = min(G.degree(), key = lambda x:x[1])[0]
-    #         othernodes = list(G.nodes)
-    #         othernodes.remove(min_degree_node)
-    #         return [min_degree_node] + degen_ordering(G.subgraph(othernodes))
-        
-    #     P = list(G.nodes)
-    #     R,X = [],[]
-    #     for v in degen_ordering(G):
-    #         Bron_Kerbosch1(R + [v],
-    #                        [p for p in P if p in G.neighbors(v)],
-    #                        [x for x in X if x in G.neighbors(v)])
-    #         P.remove(v)
-    #         X += [v]
+def nodes_from_number_of_edges(num_edges:int) -> int:
+    """Inverse of number_of_edges: returns n such that the complete graph on n vertices has num_edges edges."""
+    return (1 + isqrt(1 + 8 * num_edges)) // 2
+
+@lru_cache(maxsize=None)
+def edge_masks(number_of_nodes:int) -> tuple[tuple[int, ...], ...]:
+    """Precomputes the bitmask of every edge of the complete graph on number_of_nodes vertices.
     
-    # Bron_Kerbosch2(local_network)
+    Input:
+        :int number_of_nodes: the number of nodes
+    
+    Output:
+        :tuple masks: masks[node1][node2] is the integer with only the bit of the edge (node1,node2) set.
+            Nodes are 1-indexed, masks[v][v] and masks[0][.] are 0, and masks[node1][node2] == masks[node2][node1]"""
+    masks = [[0] * (number_of_nodes + 1) for _ in range(number_of_nodes + 1)]
+    for node1 in range(1, number_of_nodes + 1):
+        for node2 in range(node1 + 1, number_of_nodes + 1):
+            mask = 1 << (edge_to_bit_location(number_of_nodes, node1, node2) - 1)
+            masks[node1][node2] = mask
+            masks[node2][node1] = mask
+    return tuple(tuple(row) for row in masks)
 
-    return
+@lru_cache(maxsize=None)
+def vertex_masks(number_of_nodes:int) -> tuple[int, ...]:
+    """Returns for every node the bitmask of all edges incident to it (nodes are 1-indexed, entry 0 is 0)."""
+    masks = edge_masks(number_of_nodes)
+    return tuple(sum(row) for row in masks)
 
-def subgraph_isomorphism(step:int, g:str, number_of_nodes:int, h_graph:str, 
-                         h_graph_number_nodes:int, map_dict:dict, 
-                         has_been_mapped:list) -> bool:
-    # Assuming the graph from H is position on the nodes [1,...,k].
-    def check_subgraph(mapping_function:dict, g_graph:str, h_graph:str):
-        for vertex1 in range(1, h_graph_number_nodes + 1):
-            for vertex2 in range(vertex1 + 1, h_graph_number_nodes + 1):
-                if h_graph[edge_to_bit_location(number_of_nodes, vertex1, vertex2) - 1] == '1':
-                    n1, n2 = mapping_function[vertex1], mapping_function[vertex2]
-                    if n1 > n2:
-                        if g_graph[edge_to_bit_location(number_of_nodes, n2, n1) - 1] != '1':
-                            return False
-                    else:
-                        if g_graph[edge_to_bit_location(number_of_nodes, n1, n2) - 1] != '1':
-                            return False
-    
-    if step == h_graph_number_nodes:
-        if check_subgraph(map_dict, g, h_graph):
-            return True
-        pass
+def str_to_code(edge_repr:str) -> int:
+    """Converts a binary edge representation to its integer code."""
+    return int(edge_repr[::-1], 2) if edge_repr else 0
 
+def code_to_str(code:int, number_of_nodes:int) -> str:
+    """Converts an integer code to its binary edge representation on number_of_nodes vertices."""
+    return format(int(code), "0" + str(number_of_edges(number_of_nodes)) + "b")[::-1]
+
+def code_from_edges(number_of_nodes:int, edges) -> int:
+    """Returns the integer code of the graph on number_of_nodes vertices with the given (1-indexed) edges."""
+    masks = edge_masks(number_of_nodes)
+    code = 0
+    for node1, node2 in edges:
+        code |= masks[node1][node2]
+    return code
+
+def edges_from_code(code:int, number_of_nodes:int) -> list[tuple[int,int]]:
+    """Returns the (1-indexed) edges of the graph with the given integer code, in bit location order."""
+    masks = edge_masks(number_of_nodes)
+    return [(node1, node2) for node1 in range(1, number_of_nodes + 1) for node2 in range(node1 + 1, number_of_nodes + 1)
+            if code & masks[node1][node2]]
+
+def neighbourhoods(code:int, number_of_nodes:int) -> list[int]:
+    """Returns the adjacency bitmasks of the graph: bit (v - 1) of entry u is set iff (u,v) is an edge (1-indexed, entry 0 is 0)."""
+    masks = edge_masks(number_of_nodes)
+    adj = [0] * (number_of_nodes + 1)
+    for node1 in range(1, number_of_nodes + 1):
+        row = masks[node1]
+        for node2 in range(node1 + 1, number_of_nodes + 1):
+            if code & row[node2]:
+                adj[node1] |= 1 << (node2 - 1)
+                adj[node2] |= 1 << (node1 - 1)
+    return adj
+
+def popcount(code) -> int:
+    """Number of edges of a graph code. Also accepts a NumPy integer array, in which case it is applied elementwise."""
+    if isinstance(code, int):
+        return code.bit_count()
+    import numpy as np
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(code)
+    code = np.asarray(code, dtype=np.uint64)
+    table = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    count = np.zeros(code.shape, dtype=np.uint8)
+    for shift in range(0, 64, 8):
+        count += table[(code >> np.uint64(shift)) & np.uint64(0xFF)]
+    return count
+
+
+def relabel(code:int, number_of_nodes:int, permutation) -> int:
+    """Applies a relabelling of the nodes to a graph: permutation[v - 1] is the new label of node v."""
+    masks = edge_masks(number_of_nodes)
+    relabelled = 0
+    for node1, node2 in edges_from_code(code, number_of_nodes):
+        relabelled |= masks[permutation[node1 - 1]][permutation[node2 - 1]]
+    return relabelled
+
+def canonical_form(code:int, number_of_nodes:int) -> int:
+    """Returns the canonical form of a graph: the smallest code over all relabellings of its nodes.
+    Two graphs are isomorphic iff they have the same canonical form."""
+    return min(relabel(code, number_of_nodes, permutation) for permutation in permutations(range(1, number_of_nodes + 1)))
+
+def canonical_family(H, number_of_nodes:int) -> tuple[int, ...]:
+    """Returns a canonical id of a family of graphs: the sorted, distinct canonical forms of its members."""
+    return tuple(sorted({canonical_form(int(h_graph), number_of_nodes) for h_graph in H}))
+
+def find_clique(edge_repr: int, size_clique: int, number_of_nodes: int) -> bool:
+    """This function computes whether there exists a clique of the input size in the graph, given by its integer code.
+    Cliques are grown vertex by vertex on adjacency bitmasks: a vertex is only added if it is adjacent to the whole clique,
+    and a branch is cut as soon as too few common neighbours are left to complete the clique."""
+    if size_clique <= 1:
+        return size_clique <= number_of_nodes
+    adj = neighbourhoods(edge_repr, number_of_nodes)
+    # Vertices of degree < size_clique - 1 can never be in the clique
+    candidates = 0
     for vertex in range(1, number_of_nodes + 1):
-        if vertex in has_been_mapped:
-            continue
-        map_dict_copy = deepcopy(map_dict)
-        has_been_mapped_copy = deepcopy(has_been_mapped)
-        map_dict_copy[step+1] = vertex
-        has_been_mapped_copy.append(vertex)
-        subgraph_isomorphism(step+1, g, number_of_nodes, h_graph, h_graph_number_nodes, \
-                             map_dict_copy, has_been_mapped_copy)
+        if adj[vertex].bit_count() >= size_clique - 1:
+            candidates |= 1 << (vertex - 1)
+
+    def extend(candidates: int, still_needed: int) -> bool:
+        if still_needed == 0:
+            return True
+        while candidates.bit_count() >= still_needed:
+            lowest = candidates & -candidates
+            candidates ^= lowest
+            # Only look at later vertices, so every clique is tried once
+            if extend(candidates & adj[lowest.bit_length()], still_needed - 1):
+                return True
+        return False
+
+    return extend(candidates, size_clique)
+
+def h_graph_nodes(h_graph: int, number_of_nodes: int) -> list[int]:
+    """Returns the non-isolated (1-indexed) nodes of h_graph."""
+    return [vertex for vertex, mask in enumerate(vertex_masks(number_of_nodes)) if h_graph & mask]
+
+@lru_cache(maxsize=None)
+def h_embeddings(number_of_nodes: int, h_graph: int) -> tuple[int, ...]:
+    """Computes all labelled copies of h_graph in the complete graph on number_of_nodes vertices, as edge masks.
+    A graph g then contains h_graph iff g & m == m for one of the masks m.
+    
+    Input:
+        :int number_of_nodes: the number of nodes
+        :int h_graph: integer code of the graph to embed
+    
+    Output:
+        :tuple masks: the distinct edge masks, sorted"""
+    masks = edge_masks(number_of_nodes)
+    h_nodes = h_graph_nodes(h_graph, number_of_nodes)
+    h_edges = [(h_nodes.index(node1), h_nodes.index(node2)) for node1, node2 in edges_from_code(h_graph, number_of_nodes)]
+    embeddings = set()
+    for image in permutations(range(1, number_of_nodes + 1), len(h_nodes)):
+        embedding = 0
+        for node1, node2 in h_edges:
+            embedding |= masks[image[node1]][image[node2]]
+        embeddings.add(embedding)
+    return tuple(sorted(embeddings))
+
+def h_family_embeddings(number_of_nodes: int, H) -> tuple[int, ...]:
+    """Computes the edge masks of all labelled copies of the graphs in H, dropping masks that contain another mask
+    (a graph containing the larger copy also contains the smaller one)."""
+    embeddings = sorted(set().union(*(h_embeddings(number_of_nodes, h_graph) for h_graph in H)), key=lambda m: m.bit_count())
+    minimal = list()
+    for embedding in embeddings:
+        if not contains_subgraph(embedding, minimal):
+            minimal.append(embedding)
+    return tuple(minimal)
+
+def contains_subgraph(g: int, embeddings) -> bool:
+    """Returns whether g contains one of the edge masks in embeddings (see h_embeddings)."""
+    for embedding in embeddings:
+        if g & embedding == embedding:
+            return True
     return False
 
+def contains_h(g: int, number_of_nodes: int, h_graph: int) -> bool:
+    """Returns whether g has a subgraph isomorphic to h_graph, both given as integer codes on number_of_nodes vertices,
+    by testing g against the precomputed embeddings of h_graph.
+    This is also used for cliques: K_k has only C(n, k) embeddings, and testing them is faster than find_clique
+    for every k at n <= 8 (find_clique has to rebuild the neighbourhoods of g on every call)."""
+    if h_graph.bit_count() > g.bit_count():
+        return False
+    return contains_subgraph(g, h_embeddings(number_of_nodes, h_graph))
+
+def subgraph_isomorphism(g:int, number_of_nodes:int, h_graph:int) -> bool:
+    """Computes whether g has a (not necessarily induced) subgraph isomorphic to h_graph by backtracking,
+    without precomputing embeddings.
+    The nodes of h_graph are mapped one at a time, in an order where every node is adjacent to an earlier one where possible.
+    A node can only be mapped to an unused node of g with at least its degree which is adjacent to the images of all its
+    already mapped neighbours, so a partial map fails as soon as one edge cannot be extended.
+    
+    Input:
+        :int g, h_graph: integer codes of the graphs on number_of_nodes vertices
+        :int number_of_nodes: the number of nodes
+    
+    Output:
+        :bool: True if g contains a copy of h_graph"""
+    if h_graph.bit_count() > g.bit_count():
+        return False
+    g_adj = neighbourhoods(g, number_of_nodes)
+    h_adj = neighbourhoods(h_graph, number_of_nodes)
+    g_degree = [adj.bit_count() for adj in g_adj]
+
+    # Order the nodes of h_graph: highest degree first, then greedily the node with most already ordered neighbours
+    remaining = h_graph_nodes(h_graph, number_of_nodes)
+    order = list()
+    ordered_mask = 0
+    while remaining:
+        vertex = max(remaining, key=lambda v: ((h_adj[v] & ordered_mask).bit_count(), h_adj[v].bit_count()))
+        remaining.remove(vertex)
+        order.append(vertex)
+        ordered_mask |= 1 << (vertex - 1)
+    # For every position, the positions of earlier neighbours in the order
+    earlier_neighbours = [[j for j in range(i) if h_adj[order[i]] & (1 << (order[j] - 1))] for i in range(len(order))]
+    h_degree = [h_adj[v].bit_count() for v in order]
+    all_nodes = (1 << number_of_nodes) - 1
+    image = [0] * len(order)
+
+    def extend(step: int, used: int) -> bool:
+        if step == len(order):
+            return True
+        candidates = all_nodes & ~used
+        for j in earlier_neighbours[step]:
+            candidates &= g_adj[image[j]]
+        while candidates:
+            lowest = candidates & -candidates
+            candidates ^= lowest
+            vertex = lowest.bit_length()
+            if g_degree[vertex] < h_degree[step]:
+                continue
+            image[step] = vertex
+            if extend(step + 1, used | lowest):
+                return True
+        return False
+
+    return extend(0, 0)
+
 def main():
     return
 
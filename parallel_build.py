@@ -0,0 +1,90 @@
+""" This file builds the generating set S of the conflict graph in parallel over a process pool.
+Since the conflict graph is the Cayley graph with generating set S (see H_good_to_indep_set.BuildCayleyGraph), building
+S is building the conflict graph. The graph codes are split into byte-aligned index ranges, every worker evaluates the
+H-containment of its range with the edge masks and writes the packed result straight into a shared memory-mapped file,
+so only the range bounds are sent between processes and the memory of a worker only depends on the chunk size."""
+
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from edge_repr_permutations import h_family_embeddings, number_of_edges
+from H_good_to_indep_set import PackedBlock
+
+# Set in every worker by _init_worker
+_masks = None
+_bitmap = None
+
+def _init_worker(path:str, masks:list) -> None:
+    global _masks, _bitmap
+    _masks = [np.uint64(mask) for mask in masks]
+    _bitmap = np.memmap(path, dtype=np.uint8, mode="r+")
+
+def _build_range(start:int, stop:int, chunk_size:int) -> int:
+    """Fills the bitmap for the graph codes start, ..., stop - 1, chunk by chunk, and returns the number of graphs in S."""
+    hit = np.empty(chunk_size, dtype=bool)
+    scratch = np.empty(chunk_size, dtype=np.uint64)
+    count = 0
+    for chunk_start in range(start, stop, chunk_size):
+        chunk_stop = min(chunk_start + chunk_size, stop)
+        packed = PackedBlock(chunk_start, chunk_stop, _masks, hit, scratch)
+        _bitmap[chunk_start // 8: -(-chunk_stop // 8)] = packed
+        count += int(np.unpackbits(packed).sum())
+    _bitmap.flush()
+    return count
+
+def ParallelGeneratingBitmap(n:int, H:list, path:str = None, workers:int = None, ranges_per_worker:int = 4,
+                             chunk_size:int = 2**20, verbose:bool = False) -> tuple[np.memmap, float]:
+    """Computes the packed bitmap of S (as H_good_to_indep_set.GeneratingBitmap) with a pool of worker processes.
+    
+    Input:
+        :int n: number of vertices
+        :list H: family of graphs, as integer codes on n vertices
+        :str path: file to write the bitmap to; if None, a temporary file is used, read into memory and removed
+        :int workers: number of processes, os.cpu_count() if None
+        :int ranges_per_worker: the universe is split into workers * ranges_per_worker index ranges, for load balancing
+        :int chunk_size: number of graphs a worker evaluates at once (rounded up to a multiple of 8)
+        :bool verbose: print the size of S and the throughput
+    
+    Output:
+        :np.ndarray bitmap: packed bitmap (bitorder 'little'), bit g is set iff graph g is in S
+            (a read-only memory map of path if a path was given)
+        :float throughput: graphs per second over the whole universe"""
+    starttime = time.time()
+    workers = workers or os.cpu_count() or 1
+    size = 2**number_of_edges(n)
+    chunk_size = -(-chunk_size // 8) * 8
+    temporary = path is None
+    if temporary:
+        handle, path = tempfile.mkstemp(suffix=".bin")
+        os.close(handle)
+    with open(path, "wb") as file:
+        file.truncate(-(-size // 8))
+
+    # Byte-aligned ranges, so no two workers write to the same byte
+    range_size = max(8, -(-size // (8 * workers * ranges_per_worker)) * 8)
+    ranges = [(start, min(start + range_size, size)) for start in range(0, size, range_size)]
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(path, h_family_embeddings(n, H))) as pool:
+            counts = pool.map(_build_range, *zip(*ranges), [min(chunk_size, range_size)] * len(ranges))
+            S_size = sum(counts)
+    except BaseException:
+        if temporary:
+            os.remove(path)
+        raise
+
+    throughput = size / max(time.time() - starttime, 1e-9)
+    if verbose:
+        print(f"{size} graphs, |S| = {S_size}, {workers} workers, {throughput:.0f} graphs/s")
+    if temporary:
+        bitmap = np.fromfile(path, dtype=np.uint8)
+        os.remove(path)
+        return bitmap, throughput
+    return np.memmap(path, dtype=np.uint8, mode="r"), throughput
+
+def parallel_builder(workers:int = None):
+    """Returns a build function for conflict_cache.cached_generating_bitmap that uses ParallelGeneratingBitmap."""
+    return lambda n, H: ParallelGeneratingBitmap(n, H, workers=workers)[0]
@@ -0,0 +1,198 @@
+""" This file stores the solver backends for the independent set problem on the conflict graph.
+Every backend solves an IndependentSetProblem in which the first vertex (the empty graph) is always in the solution,
+optionally with the symmetry breaking levels of H_good_to_indep_set.SymmetryBreaking, and returns a SolveResult.
+Two backends are given: Gurobi, and a dependency-free branch and bound which needs no license."""
+
+import sys
+import time
+from dataclasses import dataclass, field
+import numpy as np
+
+@dataclass
+class IndependentSetProblem:
+    """An independent set problem on the graphs in 'vertices'.
+    
+    :np.ndarray vertices: graph codes of the vertices, vertices[0] == 0 is always in the solution
+    :np.ndarray rows, cols: positions (into vertices) of the endpoints of the conflict edges
+    :dict levels: symmetry breaking levels, levels[k] lists the positions of the representatives with k edges (empty if not used)"""
+    vertices: np.ndarray
+    rows: np.ndarray
+    cols: np.ndarray
+    levels: dict = field(default_factory=dict)
+
+@dataclass
+class SolveResult:
+    """The result of a solver backend.
+    
+    :int objective: size of the largest independent set found
+    :list solution: graph codes of that independent set
+    :float time: solve time in seconds (excluding building the problem)
+    :str backend: name of the backend
+    :bool optimal: whether the objective is proven optimal (False if the backend stopped early, e.g. at a time limit)
+    :str status: status of the backend, in the names of gurobipy's GRB.Status (e.g. 'OPTIMAL', 'TIME_LIMIT')
+    :list pool: further solutions, if the backend was asked for a solution pool"""
+    objective: int
+    solution: list
+    time: float
+    backend: str
+    optimal: bool
+    status: str
+    pool: list = field(default_factory=list)
+
+class GurobiBackend:
+    """Solves the problem as an ILP with gurobipy, adding all edge constraints in bulk from the edge arrays.
+    The matrix API of gurobipy (addMVar) used here also needs scipy.
+    
+    :int pool_solutions: if positive, also collect up to this many optimal solutions in the solution pool
+    :float time_limit: Gurobi's TimeLimit parameter in seconds; if it is reached, the best solution found so far is
+        returned, marked as not optimal (None for no limit)"""
+    name = "gurobi"
+
+    def __init__(self, pool_solutions:int = 0, time_limit:float = None):
+        self.pool_solutions = pool_solutions
+        self.time_limit = time_limit
+
+    def solve(self, problem:IndependentSetProblem) -> SolveResult:
+        import gurobipy as gp
+        from gurobipy import GRB
+        starttime = time.time()
+        vertices = problem.vertices
+
+        # Create a new model
+        m = gp.Model("newModel")
+        m.Params.LogToConsole = 0
+        if self.time_limit is not None:
+            m.Params.TimeLimit = self.time_limit
+        X = m.addMVar(len(vertices), vtype=GRB.BINARY, name="x")
+        m.setObjective(X.sum(), GRB.MAXIMIZE)
+        if len(problem.rows):
+            m.addConstr(X[problem.rows] + X[problem.cols] <= 1)
+        m.addConstr(X[0] >= 1)
+        if problem.levels:
+            self.add_symmetry_breaking(m, X, problem)
+
+        if self.pool_solutions > 0:
+            m.setParam(GRB.Param.PoolSearchMode, 2)
+            m.setParam(GRB.Param.PoolSolutions, self.pool_solutions)
+
+        # Optimize
+        m.optimize()
+
+        status = {getattr(GRB.Status, name): name for name in dir(GRB.Status) if name.isupper()}.get(m.Status, str(m.Status))
+        if m.SolCount == 0:
+            return SolveResult(0, list(), time.time() - starttime, self.name, False, status)
+        solution = vertices[X.X > 0.5].tolist()
+        pool = list()
+        for i in range(min(m.SolCount, self.pool_solutions)):
+            m.setParam(GRB.Param.SolutionNumber, i)
+            # PoolSearchMode 2 also keeps worse solutions when there are fewer optimal ones
+            if round(m.PoolObjVal) == round(m.ObjVal):
+                pool.append(vertices[X.Xn > 0.5].tolist())
+        return SolveResult(round(m.ObjVal), solution, time.time() - starttime, self.name, m.Status == GRB.OPTIMAL,
+                           status, pool)
+
+    @staticmethod
+    def add_symmetry_breaking(m, X, problem:IndependentSetProblem) -> None:
+        """Adds the symmetry breaking of H_good_to_indep_set.SymmetryBreaking to the model: with y_k indicating that the
+        chosen representative r has k edges,
+            sum_k y_k = 1,  sum_{representatives r with k edges} X[r] >= y_k,  X[g] + y_k <= 1 for g != 0 with fewer than k edges."""
+        from gurobipy import GRB
+        edges = np.array([int(g).bit_count() for g in problem.vertices])
+        Y = m.addMVar(len(problem.levels), vtype=GRB.BINARY, name="y")
+        m.addConstr(Y.sum() == 1)
+        for idx, (k, representatives) in enumerate(problem.levels.items()):
+            m.addConstr(X[np.asarray(representatives)].sum() >= Y[idx])
+            smaller = np.flatnonzero(edges[1:] < k) + 1
+            if len(smaller):
+                m.addConstr(X[smaller] + Y[idx] <= 1)
+
+class BranchAndBoundBackend:
+    """Solves the problem exactly with a bitset branch and bound for maximum clique in the complement of the conflict graph,
+    bounding every branch by a greedy colouring (Tomita's MCQ).
+    Vertex sets are Python integers, bit i standing for position i.
+    With symmetry breaking levels, every representative r (in order of increasing number of edges) is fixed next to the
+    empty graph in turn, and only graphs with at least as many edges as r remain, which is what makes the Cayley graph tractable.
+    
+    :float time_limit: stop after this many seconds and return the best solution found so far, marked as not optimal
+        (None for no limit)"""
+    name = "bnb"
+
+    def __init__(self, time_limit:float = None):
+        self.time_limit = time_limit
+
+    def solve(self, problem:IndependentSetProblem) -> SolveResult:
+        starttime = time.time()
+        size = len(problem.vertices)
+        everything = (1 << size) - 1
+        conflicts = [0] * size
+        for i, j in zip(problem.rows.tolist(), problem.cols.tolist()):
+            conflicts[i] |= 1 << j
+            conflicts[j] |= 1 << i
+        # compatible[i]: the vertices that can be in a solution together with vertex i
+        compatible = [everything & ~conflicts[i] & ~(1 << i) for i in range(size)]
+
+        self.best = [0]
+        self.timed_out = False
+        self.deadline = None if self.time_limit is None else starttime + self.time_limit
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(recursion_limit, size + 1000))
+        try:
+            if problem.levels:
+                edges = [int(g).bit_count() for g in problem.vertices]
+                for k in sorted(problem.levels):
+                    at_least_k = sum(1 << i for i in range(1, size) if edges[i] >= k)
+                    for r in problem.levels[k]:
+                        self.expand([0, r], compatible[0] & compatible[r] & at_least_k, compatible)
+            else:
+                self.expand([0], compatible[0], compatible)
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+
+        solution = sorted(problem.vertices[self.best].tolist())
+        return SolveResult(len(solution), solution, time.time() - starttime, self.name, not self.timed_out,
+                           "TIME_LIMIT" if self.timed_out else "OPTIMAL")
+
+    @staticmethod
+    def colour_sort(P:int, compatible:list) -> tuple[list, list]:
+        """Greedily colours the vertices of P so that vertices with the same colour are pairwise not compatible
+        (so at most one of each colour can be added). Returns the vertices in order of colour and their colours."""
+        order, colours = list(), list()
+        colour = 0
+        uncoloured = P
+        while uncoloured:
+            colour += 1
+            Q = uncoloured
+            while Q:
+                lowest = Q & -Q
+                v = lowest.bit_length() - 1
+                Q &= ~lowest & ~compatible[v]
+                uncoloured &= ~lowest
+                order.append(v)
+                colours.append(colour)
+        return order, colours
+
+    def expand(self, current:list, P:int, compatible:list) -> None:
+        if len(current) > len(self.best):
+            self.best = list(current)
+        if self.deadline is not None and time.time() > self.deadline:
+            self.timed_out = True
+            return
+        order, colours = self.colour_sort(P, compatible)
+        for idx in range(len(order) - 1, -1, -1):
+            if len(current) + colours[idx] <= len(self.best):
+                return
+            v = order[idx]
+            current.append(v)
+            self.expand(current, P & compatible[v], compatible)
+            current.pop()
+            P &= ~(1 << v)
+
+BACKENDS = {GurobiBackend.name: GurobiBackend, BranchAndBoundBackend.name: BranchAndBoundBackend}
+
+def get_backend(backend = "gurobi"):
+    """Returns a backend instance, given either an instance or the name of a backend in BACKENDS."""
+    if isinstance(backend, str):
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown backend {backend!r}, choose from {sorted(BACKENDS)}")
+        return BACKENDS[backend]()
+    return backend
@@ -0,0 +1,66 @@
+""" This file computes spectral upper bounds for the independent set problem on the conflict graph.
+The conflict graph is the Cayley graph Cay({0,1}^m, S) with xor, whose characters chi_r(x) = (-1)**(r . x) are eigenvectors.
+The eigenvalue belonging to r is sum_{s in S} chi_r(s), so all eigenvalues together are the Walsh-Hadamard transform
+of the indicator vector of S, indexed by the graph codes r."""
+
+import numpy as np
+
+from edge_repr_permutations import number_of_edges
+
+def fwht(a:np.ndarray) -> np.ndarray:
+    """In-place fast Walsh-Hadamard transform of an array of length 2**m, in O(m * 2**m).
+    The transform is unnormalised: entry r becomes sum_x (-1)**popcount(r & x) * a[x]."""
+    size = a.shape[0]
+    h = 1
+    while h < size:
+        # View the array as blocks of 2h, and butterfly the two halves of every block
+        blocks = a.reshape(-1, 2, h)
+        low = blocks[:, 0, :].copy()
+        blocks[:, 0, :] += blocks[:, 1, :]
+        blocks[:, 1, :] = low - blocks[:, 1, :]
+        h *= 2
+    return a
+
+def cayley_eigenvalues(bitmap:np.ndarray, n:int) -> np.ndarray:
+    """Computes all eigenvalues of the conflict graph on the graphs on n vertices.
+    
+    Input:
+        :np.ndarray bitmap: packed bitmap of S (see H_good_to_indep_set.GeneratingBitmap)
+        :int n: number of vertices
+    
+    Output:
+        :np.ndarray eigenvalues: eigenvalues[r] is the eigenvalue of the character chi_r, eigenvalues[0] = |S| is the degree"""
+    size = 2**number_of_edges(n)
+    indicator = np.unpackbits(np.asarray(bitmap, dtype=np.uint8), count=size, bitorder="little")
+    # |eigenvalue| <= |S| < 2**31 for m <= 30
+    return fwht(indicator.astype(np.int32 if size <= 2**30 else np.int64))
+
+def hoffman_bound(eigenvalues:np.ndarray) -> float:
+    """Hoffman (ratio) bound on the independence number of a regular graph: N * (-least) / (degree - least)."""
+    least = int(eigenvalues.min())
+    degree = int(eigenvalues[0])
+    return eigenvalues.shape[0] * (-least) / (degree - least)
+
+def cvetkovic_bound(eigenvalues:np.ndarray) -> int:
+    """Cvetkovic (inertia) bound on the independence number: zeroes + min(positive, negative)."""
+    zeroes = int(np.count_nonzero(eigenvalues == 0))
+    positive = int(np.count_nonzero(eigenvalues > 0))
+    negative = eigenvalues.shape[0] - zeroes - positive
+    return zeroes + min(positive, negative)
+
+def spectral_bounds(bitmap:np.ndarray, n:int) -> dict:
+    """Computes the spectrum of the conflict graph and the resulting upper bounds on the independence number.
+    
+    Output:
+        :dict: degree, least eigenvalue, counts of zero/positive/negative eigenvalues and the Hoffman and Cvetkovic bounds"""
+    eigenvalues = cayley_eigenvalues(bitmap, n)
+    zeroes = int(np.count_nonzero(eigenvalues == 0))
+    positive = int(np.count_nonzero(eigenvalues > 0))
+    return {"n": n,
+            "degree": int(eigenvalues[0]),
+            "least": int(eigenvalues.min()),
+            "zeroes": zeroes,
+            "positive": positive,
+            "negative": eigenvalues.shape[0] - zeroes - positive,
+            "hoffman": hoffman_bound(eigenvalues),
+            "cvetkovic": cvetkovic_bound(eigenvalues)}
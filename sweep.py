@@ -0,0 +1,200 @@
+""" This file runs the whole pipeline for a list of n and families H, and logs per-stage timings to a file.
+Every (n, H) case runs the stages enumeration, S construction, adjacency build, spectral bounds and solve, recording the
+wall time and some counters, and whether S came from the cache. With --trace-memory, every stage is run a second time under
+tracemalloc to record its peak memory; the timed run is never traced, since tracing slows it down many times.
+Results are appended to a JSON lines file (or a CSV file, if the output ends in .csv) one case at a time, and cases
+that are already in the output are skipped, so an interrupted sweep can simply be restarted.
+
+Example:
+    python sweep.py --n 4 5 6 --H K3 C4 K3+C4 --backend bnb --output sweep_results.jsonl"""
+
+import argparse
+import csv
+import json
+import os
+import time
+import tracemalloc
+from itertools import combinations
+
+from edge_repr_permutations import code_from_edges
+from conflict_cache import CACHE_DIR, cached_generating_bitmap, load_generating_bitmap
+from H_good_to_indep_set import BuildGraphs, GeneratingBitmap, ReducedProblem, bitmap_to_set
+from parallel_build import parallel_builder
+from solvers import get_backend
+from spectral import spectral_bounds
+
+STAGES = ["enumeration", "S", "spectral", "adjacency", "solve"]
+# Columns of the CSV output, the same for every record (stages that did not run are left empty)
+CSV_COLUMNS = (["n", "H", "backend", "status"]
+               + [f"stages.{stage}.{key}" for stage in STAGES for key in ("time", "peak_memory")] + ["stages.S.cache_hit"]
+               + [f"counters.{key}" for key in ("graphs", "S", "edges", "objective")]
+               + [f"spectral.{key}" for key in ("n", "degree", "least", "zeroes", "positive", "negative", "hoffman", "cvetkovic")]
+               + ["solution"])
+
+class DoesNotFit(ValueError):
+    """Raised when a named graph has more nodes than the graphs it should be placed in."""
+
+def parse_graph(name:str) -> tuple[list[tuple[int, int]], int]:
+    """Returns the edges and the number of nodes of a named graph: Kk (complete), Ck (cycle), Pk (path on k vertices)
+    or Sk (star with k leaves), placed on the nodes 1, ..., k. Raises ValueError for an unknown name."""
+    kind, k = name[:1].upper(), name[1:]
+    if not k.isdigit():
+        raise ValueError(f"unknown graph {name!r}, use Kk, Ck, Pk or Sk")
+    k = int(k)
+    if kind == "K":
+        edges = list(combinations(range(1, k + 1), 2))
+    elif kind == "C":
+        edges = [(i, i + 1) for i in range(1, k)] + [(1, k)]
+    elif kind == "P":
+        edges = [(i, i + 1) for i in range(1, k)]
+    elif kind == "S":
+        edges = [(1, i) for i in range(2, k + 2)]
+        k += 1
+    else:
+        raise ValueError(f"unknown graph {name!r}, use Kk, Ck, Pk or Sk")
+    return edges, k
+
+def named_graph(name:str, n:int) -> int:
+    """Returns the integer code on n vertices of a named graph (see parse_graph).
+    Raises DoesNotFit if it has more than n nodes."""
+    edges, k = parse_graph(name)
+    if k > n:
+        raise DoesNotFit(f"{name} does not fit on {n} vertices")
+    return code_from_edges(n, edges)
+
+def named_family(family:str, n:int) -> list[int]:
+    """Returns the codes of a family of named graphs separated by '+', e.g. 'K3+C4'."""
+    return [named_graph(name, n) for name in family.split("+")]
+
+def run_stage(record:dict, stage:str, function, *args, trace_memory:bool = False, traced_function = None):
+    """Runs function(*args), storing its wall time in record['stages'][stage].
+    With trace_memory, traced_function(*args) (function if None) is then run again under tracemalloc, and its peak
+    memory is stored as well. The result of the first, untraced run is returned."""
+    starttime = time.time()
+    result = function(*args)
+    record["stages"][stage] = {"time": time.time() - starttime}
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            (traced_function or function)(*args)
+            record["stages"][stage]["peak_memory"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+def run_case(n:int, family:str, backend:str = "bnb", solve:bool = True, cache_dir:str = CACHE_DIR,
+             workers:int = 1, trace_memory:bool = False) -> dict:
+    """Runs all stages for the graphs on n vertices and the named family, and returns the record of the run.
+    With workers > 1, S is built by parallel_build.ParallelGeneratingBitmap on a cache miss.
+    With trace_memory, every stage is repeated under tracemalloc (see run_stage); for S on a cache miss the repetition
+    builds S again without the cache, so the peak is that of the build and not of loading the file.
+    The adjacency stage builds the reduced model of IndependentSet from S (see ReducedProblem), so counters.edges counts
+    the edges among the graphs compatible with the empty graph, not those of the whole conflict graph."""
+    H = named_family(family, n)
+    record = {"n": n, "H": family, "backend": backend if solve else None, "stages": dict(), "counters": dict()}
+
+    graphs = run_stage(record, "enumeration", BuildGraphs, n, trace_memory=trace_memory)
+    record["counters"]["graphs"] = len(graphs)
+    del graphs
+
+    build = parallel_builder(workers) if workers > 1 else lambda n, H: GeneratingBitmap(n, H)[0]
+    cache_hit = load_generating_bitmap(n, H, cache_dir) is not None
+    bitmap = run_stage(record, "S", cached_generating_bitmap, n, H, build, cache_dir, trace_memory=trace_memory,
+                       traced_function=None if cache_hit else lambda n, H, build, cache_dir: build(n, H))
+    record["stages"]["S"]["cache_hit"] = cache_hit
+    S = bitmap_to_set(bitmap, n)
+    record["counters"]["S"] = len(S)
+
+    record["spectral"] = run_stage(record, "spectral", spectral_bounds, bitmap, n, trace_memory=trace_memory)
+
+    if solve:
+        problem = run_stage(record, "adjacency", ReducedProblem, n, S, trace_memory=trace_memory)
+        record["counters"]["edges"] = len(problem.rows)
+        result = run_stage(record, "solve", get_backend(backend).solve, problem, trace_memory=trace_memory)
+        record["counters"]["objective"] = result.objective
+        record["status"] = result.status
+        record["solution"] = result.solution
+    return record
+
+def flatten(record:dict, prefix:str = "") -> dict:
+    """Flattens nested dictionaries for CSV output, joining keys with dots."""
+    flat = dict()
+    for key, value in record.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, prefix + key + "."))
+        else:
+            flat[prefix + key] = json.dumps(value) if isinstance(value, list) else value
+    return flat
+
+def load_done(output:str) -> set:
+    """Returns the (n, H, backend) cases already in the output file, with backend None for cases that were not solved."""
+    if not os.path.exists(output):
+        return set()
+    with open(output, newline="") as file:
+        if output.endswith(".csv"):
+            return {(int(row["n"]), row["H"], row["backend"] or None) for row in csv.DictReader(file)}
+        return {(record["n"], record["H"], record["backend"]) for record in map(json.loads, filter(str.strip, file))}
+
+def write_record(output:str, record:dict) -> None:
+    """Appends a record to the output file."""
+    if output.endswith(".csv"):
+        new_file = not os.path.exists(output) or os.path.getsize(output) == 0
+        if not new_file:
+            with open(output, newline="") as file:
+                header = next(csv.reader(file))
+            if header != CSV_COLUMNS:
+                raise ValueError(f"{output} has different columns than CSV_COLUMNS, use a new output file")
+        with open(output, "a", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=CSV_COLUMNS, restval="")
+            if new_file:
+                writer.writeheader()
+            writer.writerow(flatten(record))
+    else:
+        with open(output, "a") as file:
+            file.write(json.dumps(record) + "\n")
+
+def sweep(ns:list[int], families:list[str], output:str, backend:str = "bnb", max_solve_n:int = 5,
+          cache_dir:str = CACHE_DIR, workers:int = 1, trace_memory:bool = False) -> list[dict]:
+    """Runs run_case for every n and family that is not in the output yet, appending each record as soon as it is done.
+    A case to solve is done if it was solved with the same backend, a case not to solve if it was run at all.
+    Cases with n > max_solve_n skip the adjacency and solve stages, and families that do not fit on n vertices are skipped.
+    Unknown graph names raise a ValueError before any case is run."""
+    for family in families:
+        for name in family.split("+"):
+            parse_graph(name)
+    done = load_done(output)
+    run = {(n, family) for n, family, _ in done}
+    records = list()
+    for n in ns:
+        for family in families:
+            if (n, family, backend) in done if n <= max_solve_n else (n, family) in run:
+                print(f"n = {n}, H = {family}: already done")
+                continue
+            try:
+                named_family(family, n)
+            except DoesNotFit as error:
+                print(f"n = {n}, H = {family}: skipped, {error}")
+                continue
+            record = run_case(n, family, backend, n <= max_solve_n, cache_dir, workers, trace_memory)
+            write_record(output, record)
+            records.append(record)
+            timings = ", ".join(f"{stage} {stats['time']:.3f}s" for stage, stats in record["stages"].items())
+            print(f"n = {n}, H = {family}: {record['counters']}, {timings}")
+    return records
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--n", type=int, nargs="+", required=True, help="numbers of vertices")
+    parser.add_argument("--H", nargs="+", default=["K3"], help="families, e.g. K3 C4 P4 S3 K3+C4")
+    parser.add_argument("--backend", default="bnb", help="solver backend (see solvers.BACKENDS)")
+    parser.add_argument("--max-solve-n", type=int, default=5, help="only solve the independent set problem up to this n")
+    parser.add_argument("--output", default="sweep_results.jsonl", help="results file (.jsonl or .csv)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="directory of the S cache")
+    parser.add_argument("--workers", type=int, default=1, help="processes used to build S (see parallel_build)")
+    parser.add_argument("--trace-memory", action="store_true", help="also measure peak memory, in a separate run of every stage")
+    args = parser.parse_args()
+    sweep(args.n, args.H, args.output, args.backend, args.max_solve_n, args.cache_dir, args.workers,
+          args.trace_memory)
+
+if __name__ == "__main__":
+    main()
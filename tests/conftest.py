@@ -0,0 +1,32 @@
+import os
+import sys
+from itertools import combinations, permutations
+
+import pytest
+
+# The modules live in the root of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from edge_repr_permutations import code_from_edges, edge_masks, edges_from_code, h_graph_nodes
+
+FAMILIES = {"K3": [(1, 2), (1, 3), (2, 3)],
+            "C4": [(1, 2), (2, 3), (3, 4), (1, 4)],
+            "K4": list(combinations(range(1, 5), 2)),
+            "P4": [(1, 2), (2, 3), (3, 4)],
+            "S3": [(1, 2), (1, 3), (1, 4)],
+            "2K2": [(1, 2), (3, 4)],
+            "C5": [(1, 2), (2, 3), (3, 4), (4, 5), (1, 5)]}
+
+def brute_force_contains(g:int, number_of_nodes:int, h_graph:int) -> bool:
+    """Reference containment test: tries every injective map of the nodes of h_graph."""
+    h_nodes = h_graph_nodes(h_graph, number_of_nodes)
+    masks = edge_masks(number_of_nodes)
+    for image in permutations(range(1, number_of_nodes + 1), len(h_nodes)):
+        mapping = dict(zip(h_nodes, image))
+        if all(g & masks[mapping[node1]][mapping[node2]] for node1, node2 in edges_from_code(h_graph, number_of_nodes)):
+            return True
+    return False
+
+@pytest.fixture
+def k3():
+    return lambda n: code_from_edges(n, FAMILIES["K3"])
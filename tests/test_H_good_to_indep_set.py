@@ -0,0 +1,144 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from conftest import FAMILIES, brute_force_contains
+from edge_repr_permutations import canonical_form, code_from_edges, code_to_str, number_of_edges
+import H_good_to_indep_set as pipeline
+
+# Optima recorded in Subgraph.ipynb for H = {K3}: (independent set, clique)
+KNOWN_K3 = {3: (4, 2), 4: (16, 4), 5: (64, 16)}
+
+def test_build_graphs():
+    graphs = pipeline.BuildGraphs(4)
+    assert graphs.dtype == np.uint64 and graphs.tolist() == list(range(64))
+    assert pipeline.BuildGraphStrings(3) == [code_to_str(g, 3) for g in range(8)]
+
+def test_symmetric_difference():
+    strings = pipeline.BuildGraphStrings(4)
+    for g1 in range(0, 64, 5):
+        for g2 in range(64):
+            expected = "".join("1" if a != b else "0" for a, b in zip(strings[g1], strings[g2]))
+            assert code_to_str(pipeline.symmetric_difference(g1, g2), 4) == expected
+
+@pytest.mark.parametrize("n", [4, 5])
+@pytest.mark.parametrize("name", ["K3", "C4", "P4"])
+def test_generating_set(n, name):
+    H = [code_from_edges(n, FAMILIES[name])]
+    expected = [g for g in range(2**number_of_edges(n)) if brute_force_contains(g, n, H[0])]
+    assert pipeline.GeneratingSet(n, H).tolist() == expected
+    bitmap, throughput = pipeline.GeneratingBitmap(n, H, block_size=64)
+    assert pipeline.bitmap_to_set(bitmap, n).tolist() == expected
+    assert throughput > 0
+
+def test_containment_cache(monkeypatch):
+    monkeypatch.setattr(pipeline, "memo", pipeline.ContainmentCache(maxsize=8))
+    n = 5
+    H = [code_from_edges(n, FAMILIES["C4"])]
+    S = pipeline.GeneratingSet(n, H)
+    assert len(pipeline.memo) == 8
+    assert pipeline.memo.hits + pipeline.memo.misses == 2**number_of_edges(n)
+    assert pipeline.bitmap_to_set(pipeline.GeneratingBitmap(n, H)[0], n).tolist() == S.tolist()
+    monkeypatch.setattr(pipeline, "memo", pipeline.ContainmentCache())
+    pipeline.GeneratingSet(n, H)
+    # One miss per unlabelled graph on 5 vertices
+    assert pipeline.memo.misses == 34
+
+def test_containment_cache_without_table(monkeypatch):
+    monkeypatch.setattr(pipeline, "memo", pipeline.ContainmentCache(maxsize=4))
+    n = 8
+    H = [code_from_edges(n, FAMILIES["K3"])]
+    triangle, other_triangle = H[0], code_from_edges(n, [(6, 7), (7, 8), (6, 8)])
+    assert pipeline.symmetric_diff_contains_an_h(triangle, 0, H, n) == 1
+    assert pipeline.symmetric_diff_contains_an_h(other_triangle, 0, H, n) == 1
+    assert pipeline.contains_an_h(triangle | 1 << 27, H, n) == 1
+    assert pipeline.contains_an_h(1 << 27, H, n) == 0
+    # Above CANONICAL_TABLE_MAX_N graphs are keyed by their own code, and the cache stays bounded
+    assert (pipeline.memo.hits, pipeline.memo.misses) == (0, 4)
+    assert pipeline.contains_an_h(triangle, H, n) == 1
+    assert (pipeline.memo.hits, len(pipeline.memo)) == (1, 4)
+    with pytest.raises(ValueError):
+        pipeline.canonical_form_table(n)
+
+def test_cayley_graph_matches_pairwise_build(k3):
+    n = 4
+    size, M = pipeline.BuildAdjancencyMatrix(pipeline.BuildGraphs(n), [k3(n)], n)
+    rows, cols = pipeline.EdgesFromMatrix(M)
+    cayley_rows, cayley_cols = pipeline.CayleyEdges(n, pipeline.GeneratingSet(n, [k3(n)]))
+    assert sorted(zip(rows.tolist(), cols.tolist())) == sorted(zip(cayley_rows.tolist(), cayley_cols.tolist()))
+
+    size, indptr, indices = pipeline.BuildCayleyGraph(n, [k3(n)])
+    for i in range(size):
+        neighbours = indices[indptr[i]:indptr[i + 1]].tolist()
+        assert neighbours == sorted([j for j in range(i) if M[i][j]] + [j for j in range(i + 1, size) if M[j][i]])
+        assert sorted(pipeline.cayley_neighbours(i, pipeline.GeneratingSet(n, [k3(n)]))) == neighbours
+
+def test_adjacency_matrix_of_a_subset(k3):
+    # On 5 vertices: the empty graph, the triangle 123, the star 1-234 and the edges 15, 23; only 7 xor 24 has a triangle
+    graphs = [0, 19, 7, 24]
+    size, M = pipeline.BuildAdjancencyMatrix(graphs, [k3(5)], 5)
+    assert size == 4
+    assert M == [[], [1], [0, 0], [0, 0, 1]]
+
+@pytest.mark.parametrize("n", [3, 4, 5])
+def test_canonical_forms(n):
+    canon = pipeline.CanonicalForms(n)
+    assert canon.tolist() == [canonical_form(g, n) for g in range(2**number_of_edges(n))]
+
+@pytest.mark.parametrize("n", sorted(KNOWN_K3))
+@pytest.mark.parametrize("reduced", [False, True])
+def test_known_optima(n, reduced, k3):
+    if n == 5 and not reduced:
+        pytest.skip("too slow without symmetry reduction")
+    S = pipeline.GeneratingSet(n, [k3(n)])
+    size = 2**number_of_edges(n)
+    edges = pipeline.CayleyEdges(n, S)
+    independent = pipeline.IndependentSet(size, edges, reduced=reduced, backend="bnb")
+    assert independent.objective == len(independent.solution) == KNOWN_K3[n][0]
+    assert not any((g1 ^ g2) in set(S.tolist()) for g1 in independent.solution for g2 in independent.solution if g1 != g2)
+    if n < 5:
+        clique = pipeline.MaxClique(size, edges, reduced=reduced, backend="bnb")
+        assert clique.objective == KNOWN_K3[n][1]
+
+@pytest.mark.parametrize("n", [3, 4, 5])
+@pytest.mark.parametrize("name", ["K3", "C4", "P4"])
+def test_reduced_problem_from_S(n, name):
+    if len(set(sum(FAMILIES[name], ()))) > n:
+        pytest.skip(f"{name} does not fit on {n} vertices")
+    S = pipeline.GeneratingSet(n, [code_from_edges(n, FAMILIES[name])])
+    size = 2**number_of_edges(n)
+    rows, cols = pipeline.CayleyEdges(n, S)
+    keep = np.ones(size, dtype=bool)
+    keep[rows[cols == 0]] = keep[cols[rows == 0]] = False
+    expected = pipeline.BuildProblem(size, rows, cols, keep, True)
+    problem = pipeline.ReducedProblem(n, S)
+    assert problem.vertices.tolist() == expected.vertices.tolist()
+    assert problem.levels == expected.levels
+    assert sorted(zip(problem.rows.tolist(), problem.cols.tolist())) == sorted(zip(expected.rows.tolist(), expected.cols.tolist()))
+    clique = pipeline.ReducedProblem(n, S, clique=True)
+    assert clique.vertices.tolist() == [0] + S.tolist()
+    in_S = set(S.tolist())
+    assert len(clique.rows) == sum((int(g1) ^ int(g2)) not in in_S for g1, g2 in combinations(clique.vertices.tolist(), 2))
+    assert all((int(clique.vertices[i]) ^ int(clique.vertices[j])) not in in_S for i, j in zip(clique.rows, clique.cols))
+
+def test_solve_from_S(k3):
+    n = 4
+    S = pipeline.GeneratingSet(n, [k3(n)])
+    assert pipeline.IndependentSet(64, S=S, reduced=True, backend="bnb").objective == KNOWN_K3[n][0]
+    assert pipeline.IndependentSet(64, S=S, backend="bnb").objective == KNOWN_K3[n][0]
+    clique = pipeline.MaxClique(64, S=S, reduced=True, backend="bnb")
+    assert clique.objective == KNOWN_K3[n][1]
+    assert all((g1 ^ g2) in set(S.tolist()) for g1, g2 in combinations(clique.solution, 2))
+
+def test_canonical_forms_are_cached():
+    assert pipeline.CanonicalForms(4) is pipeline.CanonicalForms(4)
+    assert not pipeline.CanonicalForms(4).flags.writeable
+
+@pytest.mark.parametrize("name", ["C4", "P4", "S3"])
+def test_symmetry_reduction_keeps_optimum(name):
+    n = 4
+    S = pipeline.GeneratingSet(n, [code_from_edges(n, FAMILIES[name])])
+    edges = pipeline.CayleyEdges(n, S)
+    for solve in (pipeline.IndependentSet, pipeline.MaxClique):
+        assert solve(64, edges, reduced=True, backend="bnb").objective == solve(64, edges, backend="bnb").objective
@@ -0,0 +1,93 @@
+""" Timings of the pipeline stages for n = 4, 5, 6 (run with 'pytest tests/test_benchmarks.py', compare runs with
+--benchmark-compare). Every benchmark also checks its fast path against the slow reference path."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from edge_repr_permutations import code_from_edges, contains_h, number_of_edges, subgraph_isomorphism
+import H_good_to_indep_set as pipeline
+import spectral
+
+NS = [4, 5, 6]
+
+def triangle(n):
+    return code_from_edges(n, [(1, 2), (1, 3), (2, 3)])
+
+@pytest.mark.benchmark(group="enumeration")
+@pytest.mark.parametrize("n", NS)
+def test_enumeration(benchmark, n):
+    graphs = benchmark(pipeline.BuildGraphs, n)
+    assert len(graphs) == 2**number_of_edges(n)
+
+@pytest.mark.benchmark(group="symmetric difference")
+@pytest.mark.parametrize("n", NS)
+def test_symmetric_difference(benchmark, n):
+    graphs = pipeline.BuildGraphs(n)
+    g = np.uint64(2**number_of_edges(n) // 3)
+    result = benchmark(pipeline.symmetric_difference, graphs, g)
+    assert all(int(x) == int(h) ^ int(g) for x, h in zip(result[:1000], graphs[:1000]))
+
+@pytest.mark.benchmark(group="containment")
+@pytest.mark.parametrize("n", NS)
+def test_containment(benchmark, n):
+    sample = range(0, 2**number_of_edges(n), max(1, 2**number_of_edges(n) // 2000))
+    h_graph = code_from_edges(n, [(1, 2), (2, 3), (3, 4), (1, 4)])
+    result = benchmark(lambda: [contains_h(g, n, h_graph) for g in sample])
+    assert result == [subgraph_isomorphism(g, n, h_graph) for g in sample]
+
+@pytest.mark.benchmark(group="containment")
+@pytest.mark.parametrize("n", NS)
+def test_containment_memo(benchmark, monkeypatch, n):
+    # The same sample as test_containment, through contains_an_h and a memo shared between rounds
+    monkeypatch.setattr(pipeline, "memo", pipeline.ContainmentCache())
+    sample = range(0, 2**number_of_edges(n), max(1, 2**number_of_edges(n) // 2000))
+    H = [code_from_edges(n, [(1, 2), (2, 3), (3, 4), (1, 4)])]
+    result = benchmark(lambda: [pipeline.contains_an_h(g, H, n) for g in sample])
+    assert result == [subgraph_isomorphism(g, n, H[0]) for g in sample]
+
+@pytest.mark.benchmark(group="GeneratingSet")
+@pytest.mark.parametrize("memoize", [False, True])
+@pytest.mark.parametrize("n", [5, 6])
+def test_generating_set_memo(benchmark, monkeypatch, n, memoize):
+    # The memo is shared between rounds, as in a long sweep; the memoized rounds should be faster
+    monkeypatch.setattr(pipeline, "memo", pipeline.ContainmentCache())
+    H = [code_from_edges(n, [(1, 2), (2, 3), (3, 4)])]
+    S = benchmark(pipeline.GeneratingSet, n, H, memoize)
+    assert S.tolist() == pipeline.bitmap_to_set(pipeline.GeneratingBitmap(n, H)[0], n).tolist()
+
+@pytest.mark.benchmark(group="S")
+@pytest.mark.parametrize("n", NS)
+def test_generating_bitmap(benchmark, n):
+    bitmap, _ = benchmark(pipeline.GeneratingBitmap, n, [triangle(n)])
+    if n <= 5:
+        assert pipeline.bitmap_to_set(bitmap, n).tolist() == pipeline.GeneratingSet(n, [triangle(n)]).tolist()
+
+@pytest.mark.benchmark(group="adjacency")
+@pytest.mark.parametrize("n", [4, 5])  # n = 6 has 2**15 * |S| / 2 > 4 * 10**8 edges
+def test_adjacency(benchmark, n):
+    S = pipeline.bitmap_to_set(pipeline.GeneratingBitmap(n, [triangle(n)])[0], n)
+    rows, cols = benchmark.pedantic(pipeline.CayleyEdges, (n, S), rounds=3)
+    assert len(rows) == 2**number_of_edges(n) * len(S) // 2
+    if n == 4:
+        _, M = pipeline.BuildAdjancencyMatrix(pipeline.BuildGraphs(n), [triangle(n)], n)
+        assert sorted(zip(rows.tolist(), cols.tolist())) == sorted(zip(*map(np.ndarray.tolist, pipeline.EdgesFromMatrix(M))))
+
+@pytest.mark.benchmark(group="adjacency")
+@pytest.mark.parametrize("n", [4, 5, 6])
+def test_reduced_problem(benchmark, n):
+    S = pipeline.bitmap_to_set(pipeline.GeneratingBitmap(n, [triangle(n)])[0], n)
+    problem = benchmark.pedantic(pipeline.ReducedProblem, (n, S), rounds=3)
+    assert len(problem.vertices) == 2**number_of_edges(n) - len(S)
+
+@pytest.mark.benchmark(group="eigenvalues")
+@pytest.mark.parametrize("n", NS)
+def test_eigenvalues(benchmark, n):
+    bitmap, _ = pipeline.GeneratingBitmap(n, [triangle(n)])
+    eigenvalues = benchmark(spectral.cayley_eigenvalues, bitmap, n)
+    S = pipeline.bitmap_to_set(bitmap, n)
+    assert eigenvalues[0] == len(S)
+    # Compare a few eigenvalues with the character sum of the notebook
+    for r in [1, 19, 2**number_of_edges(n) - 1]:
+        assert eigenvalues[r] == sum((-1)**bin(r & int(s)).count("1") for s in S)
@@ -0,0 +1,26 @@
+import numpy as np
+
+from edge_repr_permutations import code_from_edges
+import H_good_to_indep_set as pipeline
+import conflict_cache
+
+def test_build_on_miss_and_load(tmp_path, k3):
+    calls = list()
+    def build(n, H):
+        calls.append(n)
+        return pipeline.GeneratingBitmap(n, H)[0]
+
+    bitmap = conflict_cache.cached_generating_bitmap(5, [k3(5)], build, str(tmp_path))
+    assert isinstance(bitmap, np.memmap) and calls == [5]
+    # An isomorphic family hits the same entry
+    other_triangle = code_from_edges(5, [(3, 4), (4, 5), (3, 5)])
+    again = conflict_cache.cached_generating_bitmap(5, [other_triangle], build, str(tmp_path))
+    assert calls == [5]
+    assert np.array_equal(bitmap, again)
+    assert np.array_equal(bitmap, pipeline.GeneratingBitmap(5, [k3(5)])[0])
+
+def test_wrong_size_is_a_miss(tmp_path, k3):
+    path = conflict_cache.cache_path(4, [k3(4)], str(tmp_path))
+    with open(path, "wb") as file:
+        file.write(b"\0")
+    assert conflict_cache.load_generating_bitmap(4, [k3(4)], str(tmp_path)) is None
@@ -0,0 +1,81 @@
+import random
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from conftest import FAMILIES, brute_force_contains
+from edge_repr_permutations import (bit_location_to_edge, canonical_family, canonical_form, code_from_edges,
+                                    code_to_str, contains_h, edge_masks, edge_to_bit_location, edges_from_code, find_clique,
+                                    h_embeddings, h_family_embeddings, neighbourhoods, nodes_from_number_of_edges,
+                                    number_of_edges, popcount, relabel, str_to_code, subgraph_isomorphism, vertex_masks)
+
+@pytest.mark.parametrize("n", range(2, 12))
+def test_edge_indexing_round_trip(n):
+    edges = list(combinations(range(1, n + 1), 2))
+    assert [edge_to_bit_location(n, *edge) for edge in edges] == list(range(1, number_of_edges(n) + 1))
+    for bit_location, edge in enumerate(edges, start=1):
+        node1, node2 = bit_location_to_edge(n, bit_location)
+        assert (node1, node2) == edge
+        assert type(node1) is int and type(node2) is int
+    assert nodes_from_number_of_edges(number_of_edges(n)) == n
+
+@pytest.mark.parametrize("n", range(2, 8))
+def test_masks(n):
+    masks = edge_masks(n)
+    for node1, node2 in combinations(range(1, n + 1), 2):
+        assert masks[node1][node2] == masks[node2][node1] == 1 << (edge_to_bit_location(n, node1, node2) - 1)
+    assert sum(vertex_masks(n)) == 2 * (2**number_of_edges(n) - 1)
+
+def test_string_conversion():
+    # The triangle on the nodes 1, 2, 3 is graph 19 for n = 5, as in Subgraph.ipynb
+    triangle = code_from_edges(5, FAMILIES["K3"])
+    assert triangle == 19
+    assert code_to_str(triangle, 5) == "1100100000"
+    for code in range(2**number_of_edges(5)):
+        assert str_to_code(code_to_str(code, 5)) == code
+        assert code_from_edges(5, edges_from_code(code, 5)) == code
+
+def test_neighbourhoods_and_popcount():
+    random.seed(0)
+    codes = [random.getrandbits(number_of_edges(6)) for _ in range(50)]
+    for code in codes:
+        adj = neighbourhoods(code, 6)
+        assert sum(mask.bit_count() for mask in adj) == 2 * popcount(code)
+        assert code_to_str(code, 6).count("1") == popcount(code)
+    assert popcount(np.array(codes, dtype=np.uint64)).tolist() == [popcount(code) for code in codes]
+
+@pytest.mark.parametrize("name", sorted(FAMILIES))
+def test_containment_against_brute_force(name):
+    n = 5
+    h_graph = code_from_edges(n, FAMILIES[name])
+    embeddings = h_embeddings(n, h_graph)
+    for g in range(2**number_of_edges(n)):
+        expected = brute_force_contains(g, n, h_graph)
+        assert contains_h(g, n, h_graph) == expected
+        assert subgraph_isomorphism(g, n, h_graph) == expected
+        assert any(g & mask == mask for mask in embeddings) == expected
+
+@pytest.mark.parametrize("size_clique", range(1, 6))
+def test_find_clique(size_clique):
+    n = 5
+    clique = code_from_edges(n, combinations(range(1, size_clique + 1), 2))
+    for g in range(2**number_of_edges(n)):
+        assert find_clique(g, size_clique, n) == (size_clique == 1 or brute_force_contains(g, n, clique))
+
+def test_family_embeddings_are_minimal():
+    n = 5
+    H = [code_from_edges(n, FAMILIES["K3"]), code_from_edges(n, FAMILIES["K4"])]
+    # Every copy of K4 contains a triangle, so only the triangles remain
+    assert sorted(h_family_embeddings(n, H)) == list(h_embeddings(n, H[0]))
+
+def test_canonical_forms():
+    n = 5
+    random.seed(1)
+    for _ in range(50):
+        code = random.getrandbits(number_of_edges(n))
+        permutation = random.sample(range(1, n + 1), n)
+        relabelled = relabel(code, n, permutation)
+        assert canonical_form(relabelled, n) == canonical_form(code, n) <= code
+    assert len({canonical_form(code, n) for code in range(2**number_of_edges(n))}) == 34
+    assert canonical_family([19, code_from_edges(n, [(3, 4), (4, 5), (3, 5)]), 19], n) == (19,)
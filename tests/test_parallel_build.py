@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from conftest import FAMILIES
+from edge_repr_permutations import code_from_edges
+import H_good_to_indep_set as pipeline
+import parallel_build
+
+@pytest.mark.parametrize("n", [2, 4, 6])
+def test_parallel_matches_serial(n, tmp_path):
+    H = [code_from_edges(n, FAMILIES["K3"] if n >= 3 else [(1, 2)])]
+    bitmap, throughput = parallel_build.ParallelGeneratingBitmap(n, H, str(tmp_path / "S.bin"), workers=2, chunk_size=64)
+    assert np.array_equal(bitmap, pipeline.GeneratingBitmap(n, H)[0])
+    assert throughput > 0
+
+def test_temporary_file_is_removed(tmp_path, monkeypatch):
+    monkeypatch.setattr(parallel_build.tempfile, "tempdir", str(tmp_path))
+    H = [code_from_edges(5, FAMILIES["K3"])]
+    bitmap, _ = parallel_build.ParallelGeneratingBitmap(5, H, workers=2)
+    assert not isinstance(bitmap, np.memmap) and list(tmp_path.iterdir()) == []
+    assert np.array_equal(bitmap, pipeline.GeneratingBitmap(5, H)[0])
+
+def test_parallel_builder_in_cache(tmp_path):
+    import conflict_cache
+    H = [code_from_edges(5, FAMILIES["C4"])]
+    bitmap = conflict_cache.cached_generating_bitmap(5, H, parallel_build.parallel_builder(2), str(tmp_path))
+    assert np.array_equal(bitmap, pipeline.GeneratingBitmap(5, H)[0])
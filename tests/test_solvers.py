@@ -0,0 +1,74 @@
+import random
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+import solvers
+
+def brute_force_independent_set(size, edges):
+    conflicts = set(edges)
+    best = 0
+    for subset in range(1 << size):
+        if subset & 1 and not any(subset >> i & 1 and subset >> j & 1 for i, j in conflicts):
+            best = max(best, bin(subset).count("1"))
+    return best
+
+@pytest.mark.parametrize("seed", range(10))
+def test_branch_and_bound_against_brute_force(seed):
+    random.seed(seed)
+    size = 12
+    edges = [(i, j) for i, j in combinations(range(size), 2) if random.random() < 0.3]
+    problem = solvers.IndependentSetProblem(np.arange(size), np.array([i for i, _ in edges], dtype=np.int64),
+                                            np.array([j for _, j in edges], dtype=np.int64))
+    result = solvers.get_backend("bnb").solve(problem)
+    assert result.objective == brute_force_independent_set(size, edges)
+    assert 0 in result.solution
+    assert result.optimal and result.status == "OPTIMAL"
+    assert not any(i in result.solution and j in result.solution for i, j in edges)
+
+def test_time_limit_is_not_optimal():
+    import H_good_to_indep_set as pipeline
+    from edge_repr_permutations import code_from_edges
+    n = 5
+    S = pipeline.GeneratingSet(n, [code_from_edges(n, [(1, 2), (2, 3), (3, 4), (1, 4)])])
+    edges = pipeline.CayleyEdges(n, S)
+    problem = pipeline.BuildProblem(1024, edges[0], edges[1], np.ones(1024, dtype=bool), False)
+    result = solvers.BranchAndBoundBackend(time_limit=0).solve(problem)
+    assert not result.optimal and result.status == "TIME_LIMIT"
+    assert result.objective == len(result.solution) >= 1
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        solvers.get_backend("cplex")
+
+def test_gurobi_matches_branch_and_bound(k3):
+    pytest.importorskip("gurobipy")
+    import H_good_to_indep_set as pipeline
+    S = pipeline.GeneratingSet(4, [k3(4)])
+    edges = pipeline.CayleyEdges(4, S)
+    for reduced in (False, True):
+        assert pipeline.IndependentSet(64, edges, reduced, "gurobi").objective == 16
+
+def test_gurobi_clique_pool(k3):
+    pytest.importorskip("gurobipy")
+    import H_good_to_indep_set as pipeline
+    S = pipeline.GeneratingSet(4, [k3(4)])
+    in_S = set(S.tolist())
+    for result in (pipeline.MaxClique(64, S=S, reduced=True), pipeline.MaxClique(64, pipeline.CayleyEdges(4, S), True)):
+        assert result.objective == 4 and result.optimal
+        assert 1 <= len(result.pool) <= 10 and result.solution in result.pool
+        for clique in result.pool:
+            assert len(clique) == 4 and 0 in clique
+            assert all((g1 ^ g2) in in_S for g1, g2 in combinations(clique, 2))
+
+def test_gurobi_time_limit_is_not_optimal():
+    pytest.importorskip("gurobipy")
+    random.seed(0)
+    size = 150
+    edges = [(i, j) for i, j in combinations(range(size), 2) if random.random() < 0.1]
+    problem = solvers.IndependentSetProblem(np.arange(size), np.array([i for i, _ in edges], dtype=np.int64),
+                                            np.array([j for _, j in edges], dtype=np.int64))
+    result = solvers.GurobiBackend(time_limit=0).solve(problem)
+    assert not result.optimal and result.status == "TIME_LIMIT"
+    assert result.objective == len(result.solution)
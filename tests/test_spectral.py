@@ -0,0 +1,32 @@
+import numpy as np
+
+from edge_repr_permutations import number_of_edges
+import H_good_to_indep_set as pipeline
+import spectral
+
+# Output of eigenvalues_of_cayley_graph in Subgraph.ipynb for n = 4 and H = {K3}
+NOTEBOOK_EIGENVALUES = [23, -9, -9, 3, -9, 3, 3, 3, -9, 3, 3, -5, -5, 3, 3, -1, -9, 3, -5, 3, 3, -5, 3, -1, 3, 3, 3, -1, 3, -1, -1, -1,
+                        -9, -5, 3, 3, 3, 3, -5, -1, 3, 3, 3, -1, 3, -1, -1, -1, 3, 3, 3, -1, 3, -1, -1, -1, -5, -1, -1, -1, -1, -1, -1, 3]
+
+def test_fwht_against_definition():
+    rng = np.random.default_rng(0)
+    a = rng.integers(-5, 5, size=32)
+    expected = [sum((-1)**bin(r & x).count("1") * a[x] for x in range(32)) for r in range(32)]
+    assert spectral.fwht(a.copy()).tolist() == expected
+
+def test_notebook_spectrum(k3):
+    bitmap, _ = pipeline.GeneratingBitmap(4, [k3(4)])
+    eigenvalues = spectral.cayley_eigenvalues(bitmap, 4)
+    assert eigenvalues.tolist() == NOTEBOOK_EIGENVALUES
+    bounds = spectral.spectral_bounds(bitmap, 4)
+    assert (bounds["degree"], bounds["least"]) == (23, -9)
+    assert (bounds["zeroes"], bounds["positive"], bounds["negative"]) == (0, 30, 34)
+    assert bounds["hoffman"] == 18 and bounds["cvetkovic"] == 30
+
+def test_bounds_above_optimum(k3):
+    # The n = 5 optimum for K3 is 64 (Subgraph.ipynb)
+    bitmap, _ = pipeline.GeneratingBitmap(5, [k3(5)])
+    bounds = spectral.spectral_bounds(bitmap, 5)
+    assert bounds["hoffman"] >= 64 and bounds["cvetkovic"] >= 64
+    assert sum(spectral.cayley_eigenvalues(bitmap, 5)) == 0  # trace of the adjacency matrix
+    assert bounds["degree"] == len(pipeline.bitmap_to_set(bitmap, 5)) < 2**number_of_edges(5)
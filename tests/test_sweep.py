@@ -0,0 +1,64 @@
+import csv
+import json
+
+import pytest
+
+import sweep
+
+def test_named_family():
+    assert sweep.named_family("K3", 5) == [19]
+    assert [code.bit_count() for code in sweep.named_family("C4+P4+S3", 5)] == [4, 3, 3]
+    with pytest.raises(sweep.DoesNotFit):
+        sweep.named_graph("K6", 5)
+    for name in ["X3", "K", "Kx"]:
+        with pytest.raises(ValueError):
+            sweep.parse_graph(name)
+
+def test_unknown_family_is_an_error(tmp_path):
+    output = str(tmp_path / "results.jsonl")
+    with pytest.raises(ValueError):
+        sweep.sweep([3], ["K3", "X3"], output, cache_dir=str(tmp_path / "cache"))
+    assert not (tmp_path / "results.jsonl").exists()
+
+@pytest.mark.parametrize("output", ["results.jsonl", "results.csv"])
+def test_sweep_is_resumable(tmp_path, output):
+    output = str(tmp_path / output)
+    cache_dir = str(tmp_path / "cache")
+    records = sweep.sweep([3, 4], ["K3"], output, max_solve_n=4, cache_dir=cache_dir)
+    assert [record["counters"]["objective"] for record in records] == [4, 16]
+    assert set(records[0]["stages"]) == {"enumeration", "S", "spectral", "adjacency", "solve"}
+    assert sweep.sweep([3, 4], ["K3", "C4"], output, max_solve_n=3, cache_dir=cache_dir)[0]["H"] == "C4"
+    assert sweep.load_done(output) == {(3, "K3", "bnb"), (4, "K3", "bnb"), (4, "C4", None)}
+    if output.endswith(".jsonl"):
+        with open(output) as file:
+            assert "objective" not in json.loads(file.readlines()[-1])["counters"]
+    # Solving a case that was only run unsolved, or solving it with another backend, is a new case
+    assert sweep.sweep([3], ["K3"], output, max_solve_n=2, cache_dir=cache_dir) == []
+    records = sweep.sweep([3, 4], ["K3", "C4"], output, cache_dir=cache_dir)
+    assert [(record["n"], record["H"], record["backend"]) for record in records] == [(4, "C4", "bnb")]
+
+def test_parallel_sweep(tmp_path):
+    records = sweep.sweep([4], ["C4"], str(tmp_path / "results.jsonl"), cache_dir=str(tmp_path / "cache"), workers=2)
+    assert records[0]["counters"]["S"] == 10 and records[0]["counters"]["objective"] == 16
+
+def test_csv_columns_with_unsolved_first(tmp_path):
+    output = str(tmp_path / "results.csv")
+    sweep.sweep([4, 3], ["K3"], output, max_solve_n=3, cache_dir=str(tmp_path / "cache"))
+    with open(output, newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == sweep.CSV_COLUMNS
+    assert all(len(row) == len(sweep.CSV_COLUMNS) for row in rows)
+    unsolved, solved = (dict(zip(rows[0], row)) for row in rows[1:])
+    assert (unsolved["counters.graphs"], unsolved["counters.S"], unsolved["counters.objective"]) == ("64", "23", "")
+    assert (solved["counters.graphs"], solved["counters.S"], solved["counters.objective"]) == ("8", "1", "4")
+    assert solved["status"] == "OPTIMAL" and len(json.loads(solved["solution"])) == 4
+
+def test_memory_tracing_and_cache_hit(tmp_path):
+    output = str(tmp_path / "results.jsonl")
+    cache_dir = str(tmp_path / "cache")
+    first = sweep.run_case(4, "K3", cache_dir=cache_dir)
+    assert first["stages"]["S"]["cache_hit"] is False
+    assert all("peak_memory" not in stats for stats in first["stages"].values())
+    second = sweep.sweep([4], ["K3"], output, cache_dir=cache_dir, trace_memory=True)[0]
+    assert second["stages"]["S"]["cache_hit"] is True
+    assert all(stats["peak_memory"] > 0 for stats in second["stages"].values())